@@ -1,10 +1,16 @@
-from transformers import pipeline
 import PyPDF2
-import pandas as pd
 import os
+from functools import lru_cache
 
-# Load pre-trained NER model
-ner_pipeline = pipeline("ner", model="dbmdz/bert-large-cased-finetuned-conll03-english", tokenizer="dbmdz/bert-large-cased-finetuned-conll03-english")
+# Hub name of the NER model, or a local directory holding a copy of it on machines without internet access
+NER_MODEL = os.environ.get("NER_MODEL", "dbmdz/bert-large-cased-finetuned-conll03-english")
+
+# Function to load the pre-trained NER model on first use; transformers and the model weights take seconds to load,
+# so importing this module stays cheap
+@lru_cache(maxsize=None)
+def get_ner_pipeline():
+    from transformers import pipeline
+    return pipeline("ner", model=NER_MODEL, tokenizer=NER_MODEL)
 
 # Function to extract text from PDF
 def extract_text_from_pdf(pdf_path):
@@ -17,7 +23,7 @@ def extract_text_from_pdf(pdf_path):
 
 # Function to extract details using transformer-based NER
 def extract_details(text):
-    entities = ner_pipeline(text)
+    entities = get_ner_pipeline()(text)
     details = {
         "Name": None,
         "Location": None,
@@ -47,20 +53,23 @@ def extract_details(text):
     
     return details
 
-# Process resumes
-resume_folder = r"C:\Users\vijet\OneDrive\Desktop\Profiling Project\Resumes Data\50 Resumes"
-extracted_data = []
+if __name__ == "__main__":
+    import pandas as pd
+
+    # Process resumes
+    resume_folder = r"C:\Users\vijet\OneDrive\Desktop\Profiling Project\Resumes Data\50 Resumes"
+    extracted_data = []
 
-for resume_filename in os.listdir(resume_folder):
-    if resume_filename.endswith(".pdf"):
-        pdf_path = os.path.join(resume_folder, resume_filename)
-        resume_text = extract_text_from_pdf(pdf_path)
-        details = extract_details(resume_text)
-        details["Filename"] = resume_filename
-        extracted_data.append(details)
+    for resume_filename in os.listdir(resume_folder):
+        if resume_filename.endswith(".pdf"):
+            pdf_path = os.path.join(resume_folder, resume_filename)
+            resume_text = extract_text_from_pdf(pdf_path)
+            details = extract_details(resume_text)
+            details["Filename"] = resume_filename
+            extracted_data.append(details)
 
-# Save to Excel
-df = pd.DataFrame(extracted_data)
-df.to_excel("extracted_resume_details.xlsx", index=False)
+    # Save to Excel
+    df = pd.DataFrame(extracted_data)
+    df.to_excel("extracted_resume_details.xlsx", index=False)
 
-print("Extraction complete. Data saved to 'extracted_resume_details.xlsx'")
+    print("Extraction complete. Data saved to 'extracted_resume_details.xlsx'")
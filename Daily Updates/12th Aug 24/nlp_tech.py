@@ -1,15 +1,15 @@
 import os
 import PyPDF2
-import spacy
-import pandas as pd
+from functools import lru_cache
 
-# Initialize spaCy model
-nlp = spacy.load("en_core_web_sm")
+# Installed spaCy package name, or the path of a model directory copied onto machines without internet access
+SPACY_MODEL = os.environ.get("SPACY_MODEL", "en_core_web_sm")
 
-# Folder containing resumes in PDF format
-resume_folder = r"C:\Users\vijet\OneDrive\Desktop\Profiling Project\Resumes Data\50 Resumes"
-# List to hold extracted data
-extracted_data = []
+# Function to load the spaCy model on first use, so importing this module does not pay for spaCy and the model
+@lru_cache(maxsize=None)
+def get_nlp():
+    import spacy
+    return spacy.load(SPACY_MODEL)
 
 # Function to extract text from PDF
 def extract_text_from_pdf(pdf_path):
@@ -22,7 +22,7 @@ def extract_text_from_pdf(pdf_path):
 
 # Function to extract details using spaCy
 def extract_details(text):
-    doc = nlp(text)
+    doc = get_nlp()(text)
     details = {
         "Name": None,
         "Location": None,
@@ -55,21 +55,29 @@ def extract_details(text):
     
     return details
 
-# Process each PDF resume in the folder
-for resume_filename in os.listdir(resume_folder):
-    if resume_filename.endswith(".pdf"):
-        pdf_path = os.path.join(resume_folder, resume_filename)
-        
-        # Extract text from PDF
-        resume_text = extract_text_from_pdf(pdf_path)
-        
-        # Extract details from resume text
-        details = extract_details(resume_text)
-        details["Filename"] = resume_filename
-        extracted_data.append(details)
+if __name__ == "__main__":
+    import pandas as pd
 
-# Convert extracted data to DataFrame and save to Excel
-df = pd.DataFrame(extracted_data)
-df.to_excel("extracted_resume_details.xlsx", index=False)
+    # Folder containing resumes in PDF format
+    resume_folder = r"C:\Users\vijet\OneDrive\Desktop\Profiling Project\Resumes Data\50 Resumes"
+    # List to hold extracted data
+    extracted_data = []
 
-print("Extraction complete. Data saved to 'extracted_resume_details.xlsx'")
+    # Process each PDF resume in the folder
+    for resume_filename in os.listdir(resume_folder):
+        if resume_filename.endswith(".pdf"):
+            pdf_path = os.path.join(resume_folder, resume_filename)
+
+            # Extract text from PDF
+            resume_text = extract_text_from_pdf(pdf_path)
+
+            # Extract details from resume text
+            details = extract_details(resume_text)
+            details["Filename"] = resume_filename
+            extracted_data.append(details)
+
+    # Convert extracted data to DataFrame and save to Excel
+    df = pd.DataFrame(extracted_data)
+    df.to_excel("extracted_resume_details.xlsx", index=False)
+
+    print("Extraction complete. Data saved to 'extracted_resume_details.xlsx'")
@@ -0,0 +1,130 @@
+# Compares the original PDF -> DOCX temp-file round trip against the in-memory replacements in
+# text_extract_doc.py: time per file, bytes written to disk and how closely the text matches the
+# original converter's output.
+
+import os
+import shutil
+import tempfile
+import time
+from difflib import SequenceMatcher
+
+import pandas as pd
+from docx import Document
+from pdf2docx import Converter
+
+from text_extract_doc import extract_paragraphs_from_pdf, extract_paragraphs_via_docx_stream
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# Function to read how many bytes this process has written to storage so far (None if unavailable)
+def disk_write_bytes():
+    if psutil is not None:
+        return psutil.Process().io_counters().write_bytes
+    try:
+        with open('/proc/self/io') as io_stats:
+            for line in io_stats:
+                if line.startswith('write_bytes:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+# The original path: convert to a .docx in a temp folder, then read the paragraphs back with python-docx
+def extract_paragraphs_via_temp_docx(pdf_path, temp_docx_dir):
+    docx_path = os.path.join(temp_docx_dir, os.path.basename(pdf_path).replace('.pdf', '.docx'))
+    cv = Converter(pdf_path)
+    cv.convert(docx_path)
+    cv.close()
+    doc = Document(docx_path)
+    paragraphs = [para.text for para in doc.paragraphs]
+    temp_bytes = os.path.getsize(docx_path)
+    os.remove(docx_path)
+    return paragraphs, temp_bytes
+
+
+# Function to score how similar two texts are, ignoring whitespace differences (1.0 = identical)
+def text_similarity(reference, candidate):
+    reference = " ".join(reference.split())
+    candidate = " ".join(candidate.split())
+    if not reference and not candidate:
+        return 1.0
+    return SequenceMatcher(None, reference, candidate, autojunk=False).ratio()
+
+
+# Main function to run all three paths over a folder of PDFs and save summary and per-file sheets
+def benchmark_docx_path(pdf_folder, output_excel_path):
+    pdf_paths = [os.path.join(pdf_folder, f) for f in sorted(os.listdir(pdf_folder)) if f.lower().endswith('.pdf')]
+    temp_docx_dir = tempfile.mkdtemp(prefix='TempDocx')
+    methods = {
+        "temp_docx": lambda path: extract_paragraphs_via_temp_docx(path, temp_docx_dir),
+        "docx_stream": lambda path: (extract_paragraphs_via_docx_stream(path), 0),
+        "pymupdf_blocks": lambda path: (extract_paragraphs_from_pdf(path), 0),
+    }
+    rows = []
+    try:
+        for pdf_path in pdf_paths:
+            reference = None
+            for method, extract in methods.items():
+                written_before = disk_write_bytes()
+                start = time.perf_counter()
+                try:
+                    paragraphs, temp_bytes = extract(pdf_path)
+                    error = ""
+                except Exception as exc:
+                    paragraphs, temp_bytes = [], 0
+                    error = f"{type(exc).__name__}: {exc}"
+                elapsed = time.perf_counter() - start
+                written_after = disk_write_bytes()
+                text = "\n".join(paragraphs)
+                if method == "temp_docx":
+                    reference = text
+                rows.append({
+                    "Method": method,
+                    "Filename": os.path.basename(pdf_path),
+                    "Paragraphs": len(paragraphs),
+                    "Characters": len(text),
+                    "Time (s)": round(elapsed, 4),
+                    "Temp File Bytes": temp_bytes,
+                    "Disk Bytes Written": (written_after - written_before
+                                           if written_before is not None and written_after is not None else None),
+                    "Similarity To temp_docx": round(text_similarity(reference, text), 4) if reference is not None else None,
+                    "Error": error,
+                })
+    finally:
+        shutil.rmtree(temp_docx_dir, ignore_errors=True)
+
+    df_rows = pd.DataFrame(rows)
+    summary = []
+    for method in methods:
+        method_rows = df_rows[(df_rows["Method"] == method) & (df_rows["Error"] == "")]
+        summary.append({
+            "Method": method,
+            "Files": int((df_rows["Method"] == method).sum()),
+            "Failures": int(((df_rows["Method"] == method) & (df_rows["Error"] != "")).sum()),
+            "Total Time (s)": round(method_rows["Time (s)"].sum(), 2),
+            "Mean Time / File (s)": round(method_rows["Time (s)"].mean(), 4) if len(method_rows) else None,
+            "Temp Files Written": int((method_rows["Temp File Bytes"] > 0).sum()),
+            "Temp File Bytes": int(method_rows["Temp File Bytes"].sum()),
+            "Disk Bytes Written": (int(method_rows["Disk Bytes Written"].sum())
+                                   if method_rows["Disk Bytes Written"].notna().any() else None),
+            "Mean Similarity To temp_docx": round(method_rows["Similarity To temp_docx"].mean(), 4) if len(method_rows) else None,
+        })
+        print(summary[-1])
+
+    baseline = summary[0]["Total Time (s)"]
+    for item in summary:
+        item["Speedup vs temp_docx"] = round(baseline / item["Total Time (s)"], 2) if item["Total Time (s)"] else None
+
+    with pd.ExcelWriter(output_excel_path) as writer:
+        pd.DataFrame(summary).to_excel(writer, sheet_name="Summary", index=False)
+        df_rows.to_excel(writer, sheet_name="Per File", index=False)
+    print(f"Results saved to {output_excel_path}")
+
+if __name__ == "__main__":
+    pdf_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Resumes Data')
+    benchmark_docx_path(pdf_folder, 'docx_path_benchmark.xlsx')
@@ -1,5 +1,7 @@
+import io
 import os
 import pandas as pd
+import fitz
 from docx import Document
 from pdf2docx import Converter
 from ollama import Client
@@ -7,19 +9,33 @@ from ollama import Client
 # Initialize the client
 client = Client()
 
-# Function to convert PDF to DOCX using pdf2docx
-def convert_pdf_to_docx(pdf_path, docx_path):
+# Function to get a PDF's paragraphs in reading order straight from PyMuPDF's text blocks
+# pdf2docx builds its DOCX paragraphs from these same blocks, so this gives the paragraph-ordered text
+# without the layout conversion or a file in TempDocx
+def extract_paragraphs_from_pdf(pdf_path):
+    paragraphs = []
+    with fitz.open(pdf_path) as pdf:
+        for page in pdf:
+            # Each block is (x0, y0, x1, y1, text, block_no, block_type); block_type 1 is an image
+            for block in page.get_text("blocks", sort=True):
+                if block[6] == 0 and block[4].strip():
+                    paragraphs.append(block[4].strip())
+    return paragraphs
+
+# Function to run the full pdf2docx conversion into a memory buffer instead of a file on disk
+# Slower than extract_paragraphs_from_pdf, but yields exactly the paragraphs the converter produces
+def extract_paragraphs_via_docx_stream(pdf_path):
+    buffer = io.BytesIO()
     cv = Converter(pdf_path)
-    cv.convert(docx_path)
+    cv.convert(buffer)
     cv.close()
+    buffer.seek(0)
+    return [para.text for para in Document(buffer).paragraphs]
 
-# Function to extract text from DOCX
-def extract_text_from_docx(docx_path):
-    doc = Document(docx_path)
-    text = ""
-    for para in doc.paragraphs:
-        text += para.text + "\n"
-    return text
+# Function to extract paragraph-ordered text from a PDF, one paragraph per line
+def extract_text_from_pdf(pdf_path, exact_docx_layout=False):
+    paragraphs = extract_paragraphs_via_docx_stream(pdf_path) if exact_docx_layout else extract_paragraphs_from_pdf(pdf_path)
+    return "".join(para + "\n" for para in paragraphs)
 
 # Define a function to extract information using prompt engineering
 def extract_information(resume_text):
@@ -69,16 +85,13 @@ def extract_information(resume_text):
     return extracted_info
 
 # Function to process multiple resumes
-def process_resumes(directory_path, temp_docx_dir):
+def process_resumes(directory_path):
     data = []
     
     for filename in os.listdir(directory_path):
         if filename.endswith('.pdf'):
             pdf_path = os.path.join(directory_path, filename)
-            docx_path = os.path.join(temp_docx_dir, filename.replace('.pdf', '.docx'))
-            
-            convert_pdf_to_docx(pdf_path, docx_path)
-            resume_text = extract_text_from_docx(docx_path)
+            resume_text = extract_text_from_pdf(pdf_path)
             extracted_info = extract_information(resume_text)
             data.append(extracted_info)
     
@@ -89,15 +102,12 @@ def save_to_excel(data, output_file):
     df = pd.DataFrame(data)
     df.to_excel(output_file, index=False)
 
-# Directory containing resumes
-directory_path = r"C:\Users\vijet\OneDrive\Desktop\Profiling Project\Resumes Data\50 Resumes"
-temp_docx_dir = r"C:\Users\vijet\OneDrive\Desktop\Profiling Project\Experimentation Documents\Daily Work\14 Aug\TempDocx"
-output_file = r"C:\Users\vijet\OneDrive\Desktop\Profiling Project\Experimentation Documents\Daily Work\14 Aug\extracted_info_bydoc.xlsx"
-
-if not os.path.exists(temp_docx_dir):
-    os.makedirs(temp_docx_dir)
+if __name__ == "__main__":
+    # Directory containing resumes
+    directory_path = r"C:\Users\vijet\OneDrive\Desktop\Profiling Project\Resumes Data\50 Resumes"
+    output_file = r"C:\Users\vijet\OneDrive\Desktop\Profiling Project\Experimentation Documents\Daily Work\14 Aug\extracted_info_bydoc.xlsx"
 
-data = process_resumes(directory_path, temp_docx_dir)
-save_to_excel(data, output_file)
+    data = process_resumes(directory_path)
+    save_to_excel(data, output_file)
 
-print(f"Data saved to {output_file}")
+    print(f"Data saved to {output_file}")
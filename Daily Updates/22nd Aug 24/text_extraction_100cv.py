@@ -1,20 +1,15 @@
 import os
+import re
 import pdfplumber
 import pandas as pd
 import openpyxl
 
+# Illegal characters that are not allowed in Excel cells (chr(0) to chr(31)), removed in one regex pass
+ILLEGAL_CHARACTERS_RE = re.compile(r'[\x00-\x1f]+')
+
 # Function to clean the extracted text by removing illegal characters for Excel
 def clean_text(text):
-    # Define illegal characters that are not allowed in Excel cells
-    illegal_characters = [
-        chr(0), chr(1), chr(2), chr(3), chr(4), chr(5), chr(6), chr(7), chr(8), chr(9),
-        chr(10), chr(11), chr(12), chr(13), chr(14), chr(15), chr(16), chr(17), chr(18), chr(19),
-        chr(20), chr(21), chr(22), chr(23), chr(24), chr(25), chr(26), chr(27), chr(28), chr(29),
-        chr(30), chr(31)
-    ]
-    for char in illegal_characters:
-        text = text.replace(char, "")
-    return text
+    return ILLEGAL_CHARACTERS_RE.sub('', text)
 
 # Function to extract text from a single PDF file using pdfplumber
 def extract_text_from_pdf(pdf_path):
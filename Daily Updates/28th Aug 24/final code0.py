@@ -9,10 +9,15 @@ from ollama import Client
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 import nltk
 
-# Download the required NLTK resources
-nltk.download('stopwords')
 from nltk.corpus import stopwords
 
+# Use the stopwords corpus already installed on the machine; only download it when it is missing, so machines
+# without internet access start as long as the corpus was copied into an nltk_data folder beforehand
+try:
+    stopwords.words('english')
+except LookupError:
+    nltk.download('stopwords')
+
 # Initialize the LLM client
 client = Client()
 
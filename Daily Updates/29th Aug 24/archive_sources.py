@@ -0,0 +1,62 @@
+import os
+import tarfile
+import zipfile
+from collections import namedtuple
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+# A resume read out of an archive: name is "<archive file>:<member path>" (also used as the Filename),
+# data is the member's bytes, parsed straight from memory without unpacking to disk
+ArchiveMember = namedtuple('ArchiveMember', ['name', 'data'])
+
+
+def is_archive(path):
+    return path.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def is_resume_file(name):
+    return name.lower().endswith(RESUME_EXTENSIONS)
+
+
+# Function to get the name a resume source is reported under: the provenance string for archive members,
+# the file name for files on disk
+def source_name(source):
+    if isinstance(source, ArchiveMember):
+        return source.name
+    return os.path.basename(source)
+
+
+# Function to tell whether a member is worth reading (skips folders, macOS resource forks and other file types)
+def _wanted_member(member_path):
+    return is_resume_file(member_path) and not member_path.startswith('__MACOSX/') \
+        and not os.path.basename(member_path).startswith('._')
+
+
+def _iter_zip_members(archive_path, processed_files):
+    with zipfile.ZipFile(archive_path) as archive:
+        for info in archive.infolist():
+            name = f"{os.path.basename(archive_path)}:{info.filename}"
+            if info.is_dir() or not _wanted_member(info.filename) or name in processed_files:
+                continue
+            yield ArchiveMember(name, archive.read(info))
+
+
+# Tar archives are read in stream mode ("r|*"), one member after the other, so a .tar.gz is decompressed once
+# front to back whatever its size
+def _iter_tar_members(archive_path, processed_files):
+    with tarfile.open(archive_path, 'r|*') as archive:
+        for member in archive:
+            name = f"{os.path.basename(archive_path)}:{member.name}"
+            if not member.isfile() or not _wanted_member(member.name) or name in processed_files:
+                continue
+            file = archive.extractfile(member)
+            yield ArchiveMember(name, file.read())
+
+
+# Function to lazily yield the resumes inside a .zip or .tar(.gz) archive, skipping already processed members
+def iter_archive_members(archive_path, processed_files=()):
+    if zipfile.is_zipfile(archive_path):
+        yield from _iter_zip_members(archive_path, processed_files)
+    else:
+        yield from _iter_tar_members(archive_path, processed_files)
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from generation_profiles import consume_stream_async
+
+# Default number of requests allowed to reach the Ollama server at the same time
+DEFAULT_MAX_IN_FLIGHT = 4
+# Default per-call timeout in seconds (CPU inference on a long resume can take a while)
+DEFAULT_LLM_TIMEOUT = 300
+# End of the items in map_in_threads
+_DONE = object()
+
+
+# Async front-end for ollama.AsyncClient with an in-flight limit, per-call timeouts and cancellation
+class AsyncLLMDispatcher:
+    def __init__(self, max_in_flight=DEFAULT_MAX_IN_FLIGHT, timeout=DEFAULT_LLM_TIMEOUT, host=None):
+        # Imported here so the sync and pipeline modes never load it
+        from ollama import AsyncClient
+
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.client = AsyncClient(host=host) if host else AsyncClient()
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+        self.completed = 0
+        self.timed_out = 0
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    async def _call(self, method, **kwargs):
+        async with self.semaphore:
+            self.in_flight += 1
+            try:
+                response = await asyncio.wait_for(self._request(method, **kwargs), self.timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                raise
+            finally:
+                self.in_flight -= 1
+            self.completed += 1
+            return response
+
+    # Streams with early termination when an early_stop pattern is given (see generation_profiles.py)
+    async def _request(self, method, early_stop=None, **kwargs):
+        if early_stop:
+            chunks = await getattr(self.client, method)(stream=True, **kwargs)
+            return await consume_stream_async(chunks, early_stop)
+        return await getattr(self.client, method)(**kwargs)
+
+    async def generate(self, **kwargs):
+        return await self._call('generate', **kwargs)
+
+    async def chat(self, **kwargs):
+        return await self._call('chat', **kwargs)
+
+    # Function to submit a call from a worker thread onto the dispatcher's event loop and wait for it
+    def submit_threadsafe(self, loop, method, **kwargs):
+        future = asyncio.run_coroutine_threadsafe(self._call(method, **kwargs), loop)
+        with self._lock:
+            self._pending.add(future)
+        try:
+            return future.result()
+        finally:
+            with self._lock:
+                self._pending.discard(future)
+
+    # Function to cancel every call that is still queued or running
+    def cancel_all(self):
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.cancel()
+        return len(pending)
+
+    # Blocking client facade so the existing synchronous extractors can run unchanged in worker threads
+    def bridge(self, loop):
+        return SyncBridgeClient(self, loop)
+
+
+class SyncBridgeClient:
+    def __init__(self, dispatcher, loop):
+        self.dispatcher = dispatcher
+        self.loop = loop
+
+    def generate(self, **kwargs):
+        return self.dispatcher.submit_threadsafe(self.loop, 'generate', **kwargs)
+
+    def generate_until(self, early_stop, **kwargs):
+        return self.dispatcher.submit_threadsafe(self.loop, 'generate', early_stop=early_stop, **kwargs)
+
+    def chat(self, **kwargs):
+        return self.dispatcher.submit_threadsafe(self.loop, 'chat', **kwargs)
+
+
+# Function to run func(item) for every item in worker threads, keeping at most max_workers items active
+# Results come back in input order; failed items are returned as their exception.
+# on_result(index, result) is called as each item finishes so callers can checkpoint progress.
+# items may be any iterable: the next item is only taken once a worker is free, so a lazy source (archive
+# members read on demand) never has more than max_workers items in memory.
+async def map_in_threads(func, items, max_workers, on_result=None):
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    slots = asyncio.Semaphore(max_workers)
+    results = []
+
+    async def run(index, item):
+        try:
+            result = await loop.run_in_executor(executor, func, item)
+        except Exception as exc:
+            result = exc
+        finally:
+            slots.release()
+        results[index] = result
+        if on_result is not None:
+            on_result(index, result)
+
+    items = iter(items)
+    tasks = []
+    try:
+        while True:
+            await slots.acquire()
+            item = next(items, _DONE)
+            if item is _DONE:
+                break
+            results.append(None)
+            tasks.append(asyncio.create_task(run(len(tasks), item)))
+        await asyncio.gather(*tasks)
+    except asyncio.CancelledError:
+        for task in tasks:
+            task.cancel()
+        raise
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
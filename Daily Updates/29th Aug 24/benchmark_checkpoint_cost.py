@@ -0,0 +1,107 @@
+# Checkpoint cost against batch size: the old save_progress (concat every row so far and rewrite the workbook after
+# each resume) against result_store.ResultStore (append one row, export the workbook once at the end).
+# Rows are synthetic but shaped like final_code1.py output: the profile columns plus one observation per skill.
+
+import os
+import random
+import tempfile
+import time
+
+import pandas as pd
+
+from result_store import ResultStore
+
+BATCH_SIZES = [10, 50, 100, 200, 400]
+SKILLS = 15
+
+
+# Function to build one result row the size of a real one
+def synthetic_row(index, rng):
+    words = ["Python", "SQL", "pipelines", "experience", "built", "team", "services", "data", "models", "years"]
+    row = {
+        "Filename": f"resume_{index:05d}.pdf",
+        "Name": f"Candidate {index}",
+        "Location": "Bengaluru",
+        "Phone Number": f"+91 98{rng.randrange(10 ** 8):08d}",
+        "Email": f"candidate{index}@example.com",
+        "Github Links": f"https://github.com/candidate{index}",
+        "LinkedIn Links": f"https://linkedin.com/in/candidate-{index}",
+        "Total Experience": f"{rng.randrange(1, 15)} years",
+        "Fitment Summary": " ".join(rng.choice(words) for _ in range(120)),
+        "Score": rng.randrange(1, 11),
+    }
+    for skill in range(SKILLS):
+        row[f"Skill {skill + 1}"] = " ".join(rng.choice(words) for _ in range(40))
+    return row
+
+
+# The original checkpoint: every row so far, concatenated onto the existing workbook and rewritten
+def rewrite_workbook(rows, excel_path, df_existing):
+    pd.concat([df_existing, pd.DataFrame(rows)], ignore_index=True).to_excel(excel_path, index=False)
+
+
+# Function to time every checkpoint of one batch with both approaches; returns per-checkpoint seconds and the
+# one-off export time of the journal
+def time_batch(batch_size, work_dir, seed=0):
+    rng = random.Random(seed)
+    rows = [synthetic_row(index, rng) for index in range(batch_size)]
+
+    rewrite_seconds = []
+    excel_path = os.path.join(work_dir, f"rewrite_{batch_size}.xlsx")
+    for done in range(1, batch_size + 1):
+        start = time.perf_counter()
+        rewrite_workbook(rows[:done], excel_path, pd.DataFrame())
+        rewrite_seconds.append(time.perf_counter() - start)
+
+    append_seconds = []
+    store = ResultStore(os.path.join(work_dir, f"journal_{batch_size}.sqlite"))
+    for row in rows:
+        start = time.perf_counter()
+        store.append(row)
+        append_seconds.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    store.export_excel(os.path.join(work_dir, f"journal_{batch_size}.xlsx"))
+    export_seconds = time.perf_counter() - start
+    return rewrite_seconds, append_seconds, export_seconds
+
+
+# Main function to run every batch size and save summary and per-checkpoint sheets
+def benchmark_checkpoint_cost(output_excel_path, batch_sizes=BATCH_SIZES):
+    summary = []
+    per_checkpoint = []
+    with tempfile.TemporaryDirectory(prefix='CheckpointCost') as work_dir:
+        for batch_size in batch_sizes:
+            rewrite_seconds, append_seconds, export_seconds = time_batch(batch_size, work_dir)
+            for method, seconds in (("rewrite workbook", rewrite_seconds), ("append to journal", append_seconds)):
+                total = sum(seconds)
+                # The journal pays for one workbook write at the end of the batch
+                if method == "append to journal":
+                    total += export_seconds
+                summary.append({
+                    "Method": method,
+                    "Batch Size": batch_size,
+                    "Total Checkpoint Time (s)": round(total, 3),
+                    "Mean Checkpoint (ms)": round(1000 * sum(seconds) / len(seconds), 2),
+                    "Last Checkpoint (ms)": round(1000 * seconds[-1], 2),
+                    "Final Export (s)": round(export_seconds, 3) if method == "append to journal" else None,
+                })
+                print(summary[-1])
+                per_checkpoint.extend({"Method": method, "Batch Size": batch_size, "Checkpoint": index + 1,
+                                       "Time (ms)": round(1000 * value, 3)} for index, value in enumerate(seconds))
+
+    df_summary = pd.DataFrame(summary)
+    rewrite = df_summary[df_summary["Method"] == "rewrite workbook"].set_index("Batch Size")["Total Checkpoint Time (s)"]
+    journal = df_summary[df_summary["Method"] == "append to journal"].set_index("Batch Size")["Total Checkpoint Time (s)"]
+    df_summary["Speedup vs rewrite"] = [
+        round(rewrite[row["Batch Size"]] / row["Total Checkpoint Time (s)"], 1) if row["Total Checkpoint Time (s)"] else None
+        for _, row in df_summary.iterrows()]
+    print(f"Rewrite total grows {rewrite.iloc[-1] / rewrite.iloc[0]:.0f}x and the journal "
+          f"{journal.iloc[-1] / journal.iloc[0]:.0f}x from {batch_sizes[0]} to {batch_sizes[-1]} resumes")
+
+    with pd.ExcelWriter(output_excel_path) as writer:
+        df_summary.to_excel(writer, sheet_name="Summary", index=False)
+        pd.DataFrame(per_checkpoint).to_excel(writer, sheet_name="Per Checkpoint", index=False)
+    print(f"Results saved to {output_excel_path}")
+
+if __name__ == "__main__":
+    benchmark_checkpoint_cost('checkpoint_cost_benchmark.xlsx')
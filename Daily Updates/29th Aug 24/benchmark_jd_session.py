@@ -0,0 +1,77 @@
+import os
+import time
+import pandas as pd
+from ollama import Client
+
+import final_code1
+from final_code1 import extract_text_from_file, fitment_summary, calculate_score
+from parsed_document import parse_document
+from text_normalization import clean_document
+from jd_session import JobDescriptionSession
+from generation_profiles import generate_with_early_stop
+
+# Nanoseconds (as reported by Ollama) to seconds
+NS = 1e9
+
+# Client wrapper that records the prompt_eval/eval statistics of every generate call
+class RecordingClient:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def generate(self, early_stop=None, **kwargs):
+        response = generate_with_early_stop(self.client, early_stop, **kwargs)
+        self.calls.append({
+            "prompt_eval_count": response.get('prompt_eval_count') or 0,
+            "prompt_eval_duration": response.get('prompt_eval_duration') or 0,
+            "eval_duration": response.get('eval_duration') or 0,
+        })
+        return response
+
+# Function to score and summarize each resume with or without the JD-primed session and record prefill time
+def run_mode(file_paths, job_description_text, jd_primed):
+    # Talk to the model directly: cached answers would hide the prefill cost being measured
+    recorder = RecordingClient(Client())
+    final_code1.client = recorder
+    session = JobDescriptionSession(recorder, job_description_text) if jd_primed else None
+    if session is not None:
+        session.prime()
+        recorder.calls.clear()
+
+    rows = []
+    for file_path in file_paths:
+        # The same "llm" cleaning profile the pipeline uses for its prompts
+        cleaned_text = clean_document(parse_document(file_path).pages, "llm")
+        start = len(recorder.calls)
+        wall_start = time.time()
+        fitment_summary(cleaned_text, job_description_text, session=session)
+        calculate_score(cleaned_text, job_description_text, session=session)
+        calls = recorder.calls[start:]
+        rows.append({
+            "Mode": "JD-primed" if jd_primed else "Baseline",
+            "Filename": os.path.basename(file_path),
+            "Prompt Tokens": sum(call["prompt_eval_count"] for call in calls),
+            "Prompt Eval (s)": round(sum(call["prompt_eval_duration"] for call in calls) / NS, 3),
+            "Eval (s)": round(sum(call["eval_duration"] for call in calls) / NS, 3),
+            "Wall Time (s)": round(time.time() - wall_start, 3),
+        })
+    return rows
+
+# Main function to benchmark both modes on the same resumes and save the comparison to Excel
+def benchmark_jd_session(resume_folder, job_description_file, output_excel_path, limit=10):
+    job_description_text = "\n".join(extract_text_from_file(job_description_file))
+    file_paths = [os.path.join(resume_folder, f) for f in sorted(os.listdir(resume_folder))
+                  if f.endswith((".pdf", ".docx", ".txt"))][:limit]
+
+    rows = run_mode(file_paths, job_description_text, jd_primed=False)
+    rows += run_mode(file_paths, job_description_text, jd_primed=True)
+
+    df = pd.DataFrame(rows)
+    print(df.groupby("Mode")[["Prompt Tokens", "Prompt Eval (s)", "Eval (s)", "Wall Time (s)"]].mean())
+    df.to_excel(output_excel_path, index=False)
+    print(f"Results saved to {output_excel_path}")
+
+if __name__ == "__main__":
+    resume_folder = r'C:\Users\vijet\OneDrive\Desktop\Profiling Project\Resumes Data\10 Resumes'
+    job_description_file = r"C:\Users\vijet\OneDrive\Desktop\Profiling Project\Role Description.txt"
+    benchmark_jd_session(resume_folder, job_description_file, 'jd_session_benchmark.xlsx')
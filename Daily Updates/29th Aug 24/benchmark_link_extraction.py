@@ -0,0 +1,168 @@
+# Benchmark of link_extraction against the methods compared in 23rd Aug 24/links_comparison4.py (regex,
+# FlashText and Aho-Corasick, each building its matcher on every call) and the profile-link regex the pipeline
+# used before. Accuracy is precision/recall of (category, URL) pairs against the labeled cases in
+# link_gold_set.json; throughput is MB/s over the gold texts plus, when given, the resume corpus.
+# FlashText and pyahocorasick are optional; methods whose package is missing are skipped.
+
+import json
+import os
+import re
+import time
+
+import pandas as pd
+
+from link_extraction import extract_links, PROFILE_CATEGORIES
+from parsed_document import parse_document
+
+try:
+    from flashtext import KeywordProcessor
+except ImportError:
+    KeywordProcessor = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+GOLD_SET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'link_gold_set.json')
+
+
+# The methods as they were in links_comparison4.py, returning {category: [links]} for scoring
+def original_re(text):
+    return {"github": sorted(set(re.findall(r'github\.com/[^\s]+', text))),
+            "linkedin": sorted(set(re.findall(r'linkedin\.com/in/[^\s]+', text)))}
+
+
+def original_flashtext(text):
+    keyword_processor = KeywordProcessor()
+    keyword_processor.add_keyword("github.com")
+    keyword_processor.add_keyword("linkedin.com")
+    found = set(keyword_processor.extract_keywords(text))
+    return {"github": [word for word in found if "github.com" in word],
+            "linkedin": [word for word in found if "linkedin.com" in word]}
+
+
+def original_ahocorasick(text):
+    automaton = ahocorasick.Automaton()
+    automaton.add_word("github.com", "github.com")
+    automaton.add_word("linkedin.com", "linkedin.com")
+    automaton.make_automaton()
+    found = set(word for _, word in automaton.iter(text))
+    return {"github": [word for word in found if "github.com" in word],
+            "linkedin": [word for word in found if "linkedin.com" in word]}
+
+
+# The regex fast_extractors.py used before link_extraction.py
+PREVIOUS_URL_RE = re.compile(r'(?:https?://)?(?:www\.)?(github\.com|linkedin\.com)/[^\s,;)\]]+', re.IGNORECASE)
+
+
+def previous_fast_extractor(text):
+    links = {"github": [], "linkedin": []}
+    for match in PREVIOUS_URL_RE.finditer(text):
+        url = match.group(0).rstrip('.')
+        target = links["github"] if match.group(1).lower() == 'github.com' else links["linkedin"]
+        if url not in target:
+            target.append(url)
+    return links
+
+
+METHODS = {
+    "Regular Expressions (re)": original_re,
+    "FlashText (per call)": original_flashtext if KeywordProcessor is not None else None,
+    "Aho-Corasick (per call)": original_ahocorasick if ahocorasick is not None else None,
+    "Previous fast extractor": previous_fast_extractor,
+    "link_extraction": extract_links,
+}
+
+
+def load_gold_set(path=GOLD_SET_PATH):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+# Function to load the raw text of every resume in a folder
+def load_texts(resume_folder):
+    texts = []
+    for filename in sorted(os.listdir(resume_folder)):
+        if filename.lower().endswith(('.pdf', '.docx', '.txt')):
+            try:
+                texts.append(parse_document(os.path.join(resume_folder, filename)).text)
+            except Exception as exc:
+                print(f"Skipping {filename}: {type(exc).__name__}: {exc}")
+    return texts
+
+
+# Function to count true positives, false positives and false negatives of (category, url) pairs
+def score(predicted, expected):
+    predicted_pairs = {(category, url) for category, urls in predicted.items() for url in urls}
+    expected_pairs = {(category, url) for category, urls in expected.items() for url in urls}
+    return (len(predicted_pairs & expected_pairs), len(predicted_pairs - expected_pairs),
+            len(expected_pairs - predicted_pairs))
+
+
+# Function to time func over all inputs, repeated until at least min_seconds have passed; returns MB/s
+def throughput(func, inputs, megabytes, min_seconds=1.0):
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        for value in inputs:
+            func(value)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return megabytes * runs / elapsed
+
+
+# Main function to score and time every method and save summary and per-case sheets
+def benchmark_link_extraction(output_excel_path, resume_folder=None, min_seconds=1.0):
+    gold_set = load_gold_set()
+    texts = [case["text"] for case in gold_set]
+    if resume_folder:
+        texts += load_texts(resume_folder)
+    megabytes = sum(len(text.encode('utf-8')) for text in texts) / 1024 / 1024
+
+    summary = []
+    per_case = []
+    for method, extract in METHODS.items():
+        if extract is None:
+            print(f"Skipping {method}: package not installed")
+            continue
+        totals = [0, 0, 0]
+        exact = 0
+        for case in gold_set:
+            predicted = extract(case["text"])
+            counts = score(predicted, case["expected"])
+            totals = [total + count for total, count in zip(totals, counts)]
+            exact += counts[1] == counts[2] == 0
+            per_case.append({
+                "Method": method,
+                "Case": case["id"],
+                "Expected": "; ".join(url for category in PROFILE_CATEGORIES for url in case["expected"][category]),
+                "Found": "; ".join(url for urls in predicted.values() for url in urls),
+                "Correct": counts[0],
+                "False Positives": counts[1],
+                "Missed": counts[2],
+            })
+        true_positives, false_positives, false_negatives = totals
+        precision = true_positives / (true_positives + false_positives) if true_positives + false_positives else 0.0
+        recall = true_positives / (true_positives + false_negatives) if true_positives + false_negatives else 0.0
+        summary.append({
+            "Method": method,
+            "Gold Cases": len(gold_set),
+            "Exact Cases": exact,
+            "Precision": round(precision, 3),
+            "Recall": round(recall, 3),
+            "F1": round(2 * precision * recall / (precision + recall), 3) if precision + recall else 0.0,
+            "Texts Timed": len(texts),
+            "Throughput (MB/s)": round(throughput(extract, texts, megabytes, min_seconds), 2),
+        })
+        print(summary[-1])
+
+    with pd.ExcelWriter(output_excel_path) as writer:
+        pd.DataFrame(summary).to_excel(writer, sheet_name="Summary", index=False)
+        pd.DataFrame(per_case).to_excel(writer, sheet_name="Per Case", index=False)
+    print(f"Results saved to {output_excel_path}")
+
+if __name__ == "__main__":
+    resume_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Resumes Data')
+    benchmark_link_extraction('link_extraction_benchmark.xlsx', resume_folder if os.path.isdir(resume_folder) else None)
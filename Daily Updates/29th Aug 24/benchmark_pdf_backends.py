@@ -0,0 +1,100 @@
+# Compares the PDF text backends in parsed_document.PDF_BACKENDS over the resume corpus:
+# pages per second, peak RSS and the text_quality score. Each backend runs in its own child
+# process so its peak memory is measured in isolation.
+
+import os
+import time
+import multiprocessing
+
+import pandas as pd
+
+from parsed_document import PDF_BACKENDS, MIN_TEXT_QUALITY, text_quality
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# Function to read the peak resident set size of the current process in MB (None if unavailable)
+def peak_rss_mb():
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return round(peak / 1024 / (1024 if os.uname().sysname == 'Darwin' else 1), 1)
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return round(getattr(info, 'peak_wset', info.rss) / 1024 / 1024, 1)
+    return None
+
+
+# Function run in a child process: parse every PDF with one backend and report per-file results
+def run_backend(backend, pdf_paths, queue):
+    rows = []
+    start_rss = peak_rss_mb()
+    for pdf_path in pdf_paths:
+        start = time.perf_counter()
+        try:
+            document = PDF_BACKENDS[backend](pdf_path)
+            error = ""
+        except Exception as exc:
+            document = None
+            error = f"{type(exc).__name__}: {exc}"
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "Backend": backend,
+            "Filename": os.path.basename(pdf_path),
+            "Pages": len(document.pages) if document else 0,
+            "Characters": len(document.text) if document else 0,
+            "Links": len(document.annotation_uris) if document else 0,
+            "Text Quality": round(text_quality(document.text), 3) if document else 0.0,
+            "Time (s)": round(elapsed, 4),
+            "Error": error,
+        })
+    queue.put((rows, start_rss, peak_rss_mb()))
+
+
+# Main function to benchmark all backends and save per-file and summary sheets to Excel
+def benchmark_pdf_backends(pdf_folder, output_excel_path, backends=None):
+    pdf_paths = [os.path.join(pdf_folder, f) for f in sorted(os.listdir(pdf_folder)) if f.lower().endswith('.pdf')]
+    all_rows = []
+    summary = []
+    for backend in backends or list(PDF_BACKENDS):
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=run_backend, args=(backend, pdf_paths, queue))
+        process.start()
+        rows, start_rss, end_rss = queue.get()
+        process.join()
+        all_rows.extend(rows)
+
+        parsed = [row for row in rows if not row["Error"]]
+        total_time = sum(row["Time (s)"] for row in parsed)
+        total_pages = sum(row["Pages"] for row in parsed)
+        summary.append({
+            "Backend": backend,
+            "Files": len(rows),
+            "Failures": len(rows) - len(parsed),
+            "Pages": total_pages,
+            "Pages / s": round(total_pages / total_time, 2) if total_time else None,
+            "Mean Time / File (s)": round(total_time / len(parsed), 4) if parsed else None,
+            "Peak RSS (MB)": end_rss,
+            "RSS Growth (MB)": round(end_rss - start_rss, 1) if end_rss is not None and start_rss is not None else None,
+            "Mean Text Quality": round(sum(row["Text Quality"] for row in parsed) / len(parsed), 3) if parsed else None,
+            "Low Quality Files": sum(1 for row in parsed if row["Text Quality"] < MIN_TEXT_QUALITY),
+        })
+        print(summary[-1])
+
+    with pd.ExcelWriter(output_excel_path) as writer:
+        pd.DataFrame(summary).to_excel(writer, sheet_name="Summary", index=False)
+        pd.DataFrame(all_rows).to_excel(writer, sheet_name="Per File", index=False)
+    print(f"Results saved to {output_excel_path}")
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    pdf_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Resumes Data')
+    benchmark_pdf_backends(pdf_folder, 'pdf_backend_benchmark.xlsx')
@@ -0,0 +1,72 @@
+# Measures how many prompt tokens each cleaning profile costs per resume, using the model's own
+# prompt_eval_count: every variant is sent once as a prefill-only request (num_predict 1) and the
+# reported token counts are compared. Point OLLAMA_HOST at ollama_standin.py to run it offline.
+
+import os
+
+import pandas as pd
+from ollama import Client
+
+from parsed_document import parse_document
+from text_normalization import clean_document
+
+MODEL = "llama3:latest"
+PROMPT_TEMPLATE = "Resume Text:\n{resume_text}\n"
+
+# "raw" is the extracted text untouched; the other variants are the cleaning profiles
+VARIANTS = {
+    "raw": lambda pages: "\n".join(page for page in pages if page),
+    "lexical": lambda pages: clean_document(pages, "lexical"),
+    "llm": lambda pages: clean_document(pages, "llm"),
+}
+
+
+# Function to get the model's prompt token count for a text, without generating more than one token
+def prompt_tokens(client, text, model=MODEL):
+    response = client.generate(model=model, prompt=PROMPT_TEMPLATE.format(resume_text=text),
+                               options={"num_predict": 1, "temperature": 0}, keep_alive="30m")
+    get = response.get if hasattr(response, 'get') else lambda field: getattr(response, field, None)
+    return get('prompt_eval_count')
+
+
+# Main function to measure every variant for every resume and save per-resume and summary sheets
+def benchmark_prompt_compression(resume_folder, output_excel_path, model=MODEL):
+    client = Client()
+    rows = []
+    for filename in sorted(os.listdir(resume_folder)):
+        if not filename.lower().endswith(('.pdf', '.docx', '.txt')):
+            continue
+        pages = parse_document(os.path.join(resume_folder, filename)).pages
+        row = {"Filename": filename}
+        for variant, build in VARIANTS.items():
+            text = build(pages)
+            row[f"{variant} Characters"] = len(text)
+            row[f"{variant} Tokens"] = prompt_tokens(client, text, model)
+        if row["raw Tokens"] and row["llm Tokens"] is not None:
+            row["Tokens Saved vs raw"] = row["raw Tokens"] - row["llm Tokens"]
+            row["Saved vs raw (%)"] = round(100 * row["Tokens Saved vs raw"] / row["raw Tokens"], 1)
+        if row["lexical Tokens"] and row["llm Tokens"] is not None:
+            row["Tokens Saved vs lexical"] = row["lexical Tokens"] - row["llm Tokens"]
+        rows.append(row)
+        print(row)
+
+    df_rows = pd.DataFrame(rows)
+    summary = []
+    for variant in VARIANTS:
+        tokens = df_rows[f"{variant} Tokens"].dropna()
+        summary.append({
+            "Variant": variant,
+            "Resumes": len(tokens),
+            "Total Tokens": int(tokens.sum()),
+            "Mean Tokens / Resume": round(tokens.mean(), 1) if len(tokens) else None,
+            "Mean Characters / Resume": round(df_rows[f"{variant} Characters"].mean(), 1),
+        })
+    with pd.ExcelWriter(output_excel_path) as writer:
+        pd.DataFrame(summary).to_excel(writer, sheet_name="Summary", index=False)
+        df_rows.to_excel(writer, sheet_name="Per Resume", index=False)
+    print(pd.DataFrame(summary))
+    print(f"Results saved to {output_excel_path}")
+
+if __name__ == "__main__":
+    resume_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Resumes Data')
+    benchmark_prompt_compression(resume_folder, 'prompt_compression_benchmark.xlsx')
@@ -0,0 +1,110 @@
+# Startup-time benchmark: how long importing the pipeline modules takes before and after stopwords were
+# vendored and the heavy libraries (pandas, pdfplumber, PyMuPDF, sklearn, nltk, ollama) made lazy.
+# The baseline is this folder as of a git ref given with --baseline-ref (the commit before the lazy-import
+# changes, e.g. the merge-base with the main branch), taken with git archive; each module is imported in a fresh
+# interpreter with `python -X importtime` and the cumulative import time of everything it pulled in is compared.
+# The baseline calls nltk.download() at import, so on a machine without internet access it can stall until
+# the timeout; that is recorded as a timeout rather than a time.
+
+import argparse
+import io
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+import pandas as pd
+
+# Modules that can be imported without running anything; the final_code0/2/3/4 scripts run their pipeline at import
+MODULES = ["final_code1", "parsed_document", "text_normalization", "ocr_queue", "async_dispatch"]
+
+# "import time:       250 |        250 |   _io" -> self us, cumulative us, module name
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S+)')
+
+
+# Function to copy the source folder as it was at a git ref into a temp folder; returns the folder path
+def checkout_baseline(ref, target_dir):
+    source_dir = os.path.dirname(os.path.abspath(__file__))
+    # Run from inside the folder, git archive only includes this folder, with its files at the top of the archive
+    archive = subprocess.run(["git", "archive", "--format=tar", ref], cwd=source_dir,
+                             capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target_dir)
+    return target_dir
+
+
+# Function to import a module once in a fresh interpreter; returns (wall seconds, {module: (self us, cumulative us)}, error)
+# It runs in a scratch folder so the stores the module opens (llm_cache.sqlite, ...) are not created next to the code
+def import_once(module, source_dir, scratch_dir, timeout):
+    env = dict(os.environ, PYTHONPATH=source_dir + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=scratch_dir,
+                                   env=env, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return None, {}, f"timed out after {timeout}s"
+    wall = time.perf_counter() - start
+    modules = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        modules[match.group(3)] = (int(match.group(1)), int(match.group(2)))
+    error = "" if completed.returncode == 0 else completed.stderr.strip().splitlines()[-1]
+    return wall, modules, error
+
+
+# Main function to import every module runs times in both versions and save summary and top-import sheets
+def benchmark_startup(output_excel_path, baseline_ref, modules=MODULES, runs=5, timeout=120, top_n=15):
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    summary = []
+    top_imports = []
+    with tempfile.TemporaryDirectory(prefix='StartupBaseline') as baseline_root, \
+            tempfile.TemporaryDirectory(prefix='StartupScratch') as scratch_dir:
+        versions = {"baseline": checkout_baseline(baseline_ref, baseline_root), "new": current_dir}
+        for module in modules:
+            row = {"Module": module}
+            for version, source_dir in versions.items():
+                walls, totals, errors = [], [], []
+                last_modules = {}
+                for _ in range(runs):
+                    wall, imported, error = import_once(module, source_dir, scratch_dir, timeout)
+                    if error:
+                        errors.append(error)
+                    if wall is None:
+                        # A stalled import will stall again; do not wait for it runs times
+                        break
+                    walls.append(wall)
+                    # The module's own cumulative time covers everything it imported
+                    if module in imported:
+                        totals.append(imported[module][1])
+                    last_modules = imported
+                row[f"{version} Wall (s)"] = round(statistics.median(walls), 3) if walls else None
+                row[f"{version} Import Time (s)"] = round(statistics.median(totals) / 1e6, 3) if totals else None
+                row[f"{version} Modules Imported"] = len(last_modules)
+                row[f"{version} Error"] = errors[0] if errors else ""
+                for name, (self_us, cumulative_us) in sorted(last_modules.items(), key=lambda item: -item[1][1])[:top_n]:
+                    top_imports.append({"Module": module, "Version": version, "Import": name,
+                                        "Self (ms)": round(self_us / 1000, 1),
+                                        "Cumulative (ms)": round(cumulative_us / 1000, 1)})
+            if row["baseline Wall (s)"] and row["new Wall (s)"]:
+                row["Wall Speedup"] = round(row["baseline Wall (s)"] / row["new Wall (s)"], 2)
+            summary.append(row)
+            print(row)
+
+    with pd.ExcelWriter(output_excel_path) as writer:
+        pd.DataFrame(summary).to_excel(writer, sheet_name="Summary", index=False)
+        pd.DataFrame(top_imports).to_excel(writer, sheet_name="Top Imports", index=False)
+    print(f"Results saved to {output_excel_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare import times against an earlier version of this folder")
+    parser.add_argument("--baseline-ref", required=True,
+                        help="git ref of the version to compare against, e.g. $(git merge-base HEAD main)")
+    parser.add_argument("--output", default='startup_benchmark.xlsx')
+    args = parser.parse_args()
+    benchmark_startup(args.output, args.baseline_ref)
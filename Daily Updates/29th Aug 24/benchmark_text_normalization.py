@@ -0,0 +1,115 @@
+# Microbenchmark of text_normalization against the original cleaning functions: MB/s on the resume
+# corpus for clean_text, clean_text_column, the Excel control-character strip and the pandas Series
+# variants. Every new result is checked against the original output before it is timed.
+
+import os
+import re
+import time
+
+import pandas as pd
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from nltk.corpus import stopwords
+
+from parsed_document import parse_document
+from text_normalization import (clean_text, clean_text_column, remove_excel_illegal, clean_text_series,
+                                clean_text_column_series)
+
+
+# The functions as they were in final_code1.py and 22nd Aug 24/text_extraction_100cv.py
+def original_clean_text(text):
+    text = ''.join(char for char in text if char.isprintable())
+    stop_words = set(stopwords.words('english')).union(set(ENGLISH_STOP_WORDS))
+    cleaned_text = ' '.join(word for word in text.split() if word.lower() not in stop_words)
+    return cleaned_text
+
+
+def original_clean_text_column(text):
+    if isinstance(text, str):
+        text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
+        text = re.sub(r'(\d)([A-Z])', r'\1 \2', text)
+        text = re.sub(r'([A-Z])([A-Z][a-z])', r'\1 \2', text)
+        text = re.sub(r'(\d)([a-zA-Z])', r'\1 \2', text)
+    return text
+
+
+def original_remove_excel_illegal(text):
+    for char in [chr(code) for code in range(32)]:
+        text = text.replace(char, "")
+    return text
+
+
+# Function to load the raw page texts of every resume in a folder
+def load_pages(resume_folder):
+    pages = []
+    for filename in sorted(os.listdir(resume_folder)):
+        if filename.lower().endswith(('.pdf', '.docx', '.txt')):
+            try:
+                pages.extend(page for page in parse_document(os.path.join(resume_folder, filename)).pages if page)
+            except Exception as exc:
+                print(f"Skipping {filename}: {type(exc).__name__}: {exc}")
+    return pages
+
+
+# Function to time func over all inputs, repeated until at least min_seconds have passed; returns MB/s
+def throughput(func, inputs, megabytes, min_seconds=1.0):
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        for value in inputs:
+            func(value)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return megabytes * runs / elapsed
+
+
+# Main function to compare old and new implementations and save the results to Excel
+def benchmark_text_normalization(resume_folder, output_excel_path, min_seconds=1.0):
+    pages = load_pages(resume_folder)
+    page_megabytes = sum(len(page.encode('utf-8')) for page in pages) / 1024 / 1024
+    cleaned_pages = [original_clean_text(page) for page in pages]
+    cleaned_megabytes = sum(len(page.encode('utf-8')) for page in cleaned_pages) / 1024 / 1024
+    page_series = pd.Series(pages)
+    cleaned_series = pd.Series(cleaned_pages)
+
+    cases = [
+        ("clean_text", original_clean_text, clean_text, pages, page_megabytes),
+        ("clean_text_column", original_clean_text_column, clean_text_column, cleaned_pages, cleaned_megabytes),
+        ("remove_excel_illegal", original_remove_excel_illegal, remove_excel_illegal, pages, page_megabytes),
+    ]
+    series_cases = [
+        ("clean_text (Series)", lambda s: s.map(original_clean_text), clean_text_series, page_series, page_megabytes),
+        ("clean_text_column (Series)", lambda s: s.map(original_clean_text_column), clean_text_column_series,
+         cleaned_series, cleaned_megabytes),
+    ]
+
+    results = []
+    for name, original, new, inputs, megabytes in cases:
+        mismatches = sum(1 for value in inputs if original(value) != new(value))
+        results.append((name, original, new, inputs, megabytes, mismatches))
+    for name, original, new, series, megabytes in series_cases:
+        mismatches = int((original(series) != new(series)).sum())
+        # A whole Series is one input
+        results.append((name, original, new, [series], megabytes, mismatches))
+
+    rows = []
+    for name, original, new, inputs, megabytes, mismatches in results:
+        original_mb_s = throughput(original, inputs, megabytes, min_seconds)
+        new_mb_s = throughput(new, inputs, megabytes, min_seconds)
+        rows.append({
+            "Function": name,
+            "Pages": len(pages),
+            "Input (MB)": round(megabytes, 3),
+            "Original (MB/s)": round(original_mb_s, 2),
+            "New (MB/s)": round(new_mb_s, 2),
+            "Speedup": round(new_mb_s / original_mb_s, 2) if original_mb_s else None,
+            "Mismatched Outputs": mismatches,
+        })
+        print(rows[-1])
+
+    pd.DataFrame(rows).to_excel(output_excel_path, index=False)
+    print(f"Results saved to {output_excel_path}")
+
+if __name__ == "__main__":
+    resume_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Resumes Data')
+    benchmark_text_normalization(resume_folder, 'text_normalization_benchmark.xlsx')
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from parsed_document import ParsedDocument
+
+# Default location of the persistent extracted-text cache
+DEFAULT_EXTRACTION_CACHE_PATH = 'extraction_cache.sqlite'
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+# Function to compute the SHA-256 of a file's content in fixed-size chunks
+def file_sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Parsed documents stored by (content hash, extractor version) with zlib-compressed JSON pages and links.
+# A second table remembers (path, size, mtime) -> hash so unchanged files are not even re-hashed;
+# renamed or re-uploaded copies hash to the same key and reuse the stored extraction.
+class ExtractionCache:
+    def __init__(self, path=DEFAULT_EXTRACTION_CACHE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.hashes_skipped = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        conn = self._connection()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                content_hash TEXT NOT NULL,
+                extractor_version TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (content_hash, extractor_version)
+            );
+            CREATE TABLE IF NOT EXISTS file_index (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL
+            );
+        """)
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, name):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    # Function to get a file's content hash, trusting the stored hash while size and mtime are unchanged
+    def content_hash(self, file_path):
+        stat = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        conn = self._connection()
+        row = conn.execute("SELECT size, mtime_ns, content_hash FROM file_index WHERE path = ?", (key,)).fetchone()
+        if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            self._count('hashes_skipped')
+            return row[2]
+        content_hash = file_sha256(file_path)
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO file_index (path, size, mtime_ns, content_hash) VALUES (?, ?, ?, ?)",
+                         (key, stat.st_size, stat.st_mtime_ns, content_hash))
+        return content_hash
+
+    def get(self, content_hash, extractor_version, file_path):
+        row = self._connection().execute(
+            "SELECT payload FROM documents WHERE content_hash = ? AND extractor_version = ?",
+            (content_hash, extractor_version)).fetchone()
+        if row is None:
+            return None
+        return ParsedDocument.from_dict(file_path, json.loads(zlib.decompress(row[0])))
+
+    def put(self, content_hash, extractor_version, document):
+        payload = zlib.compress(json.dumps(document.to_dict(), ensure_ascii=False).encode('utf-8'), 6)
+        conn = self._connection()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO documents (content_hash, extractor_version, payload, created_at) "
+                         "VALUES (?, ?, ?, ?)", (content_hash, extractor_version, payload, time.time()))
+
+    # Function to return the parsed document for a file, calling parse() only on a cache miss
+    # In-memory sources (archive members) pass their bytes as data and are hashed directly
+    def load(self, file_path, parse, extractor_version, data=None):
+        content_hash = hashlib.sha256(data).hexdigest() if data is not None else self.content_hash(file_path)
+        document = self.get(content_hash, extractor_version, file_path)
+        if document is None:
+            self._count('misses')
+            document = parse()
+            self.put(content_hash, extractor_version, document)
+        else:
+            self._count('hits')
+        document.content_hash = content_hash
+        return document
+
+    def print_stats(self):
+        print(f"Extraction cache: {self.hits} hits, {self.misses} parsed, {self.hashes_skipped} files not re-hashed")
@@ -0,0 +1,83 @@
+import re
+import threading
+
+# Results at or above this confidence are used as-is; anything lower falls back to the LLM
+CONFIDENCE_THRESHOLD = 0.9
+
+# Registry of deterministic extractors: name -> function(text) returning {"value": ..., "confidence": float}
+FAST_EXTRACTORS = {}
+
+
+def register(name):
+    def decorator(func):
+        FAST_EXTRACTORS[name] = func
+        return func
+    return decorator
+
+
+# Compiled once per process. Separators inside a number are spaces, tabs, dots and dashes but not line breaks,
+# so a number is never joined with the digits on the next line (a year, a pin code).
+PHONE_RE = re.compile(r'(?<![\w+])(\+?\d{1,3}[ \t.-]?)?(\(?\d{2,5}\)?[ \t.-]?)?\d{3,5}[ \t.-]?\d{3,5}(?![\w])')
+EMAIL_RE = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+
+
+# Function to decide whether a digit string looks like a real phone number (not a date range or ID)
+def is_plausible_phone(raw, digits):
+    if len(digits) == 10:
+        return True
+    if 11 <= len(digits) <= 13:
+        return raw.lstrip().startswith('+') or digits.startswith(('91', '0'))
+    return False
+
+
+@register('phone')
+def fast_phone(text):
+    candidates = []
+    for match in PHONE_RE.finditer(text or ''):
+        raw = match.group(0).strip()
+        digits = re.sub(r'\D', '', raw)
+        if is_plausible_phone(raw, digits) and digits[-10:] not in [d[-10:] for _, d in candidates]:
+            candidates.append((raw, digits))
+    if not candidates:
+        return {"value": None, "confidence": 0.0}
+    # One number is the usual case; several distinct numbers are ambiguous and go to the LLM
+    confidence = 0.95 if len(candidates) == 1 else 0.5
+    return {"value": candidates[0][0], "confidence": confidence}
+
+
+@register('email')
+def fast_email(text):
+    emails = list(dict.fromkeys(match.group(0).rstrip('.') for match in EMAIL_RE.finditer(text or '')))
+    if not emails:
+        return {"value": None, "confidence": 0.0}
+    return {"value": emails[0], "confidence": 0.95 if len(emails) == 1 else 0.7}
+
+
+# Counters of how often the fast path answered instead of the LLM, recorded by the caller where a call is skipped
+class FastPathStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.avoided = {}
+        self.fallbacks = {}
+
+    def record(self, name, used_fast_path):
+        with self.lock:
+            counter = self.avoided if used_fast_path else self.fallbacks
+            counter[name] = counter.get(name, 0) + 1
+
+    def report(self):
+        with self.lock:
+            names = sorted(set(self.avoided) | set(self.fallbacks))
+            return {name: {"llm_calls_avoided": self.avoided.get(name, 0),
+                           "llm_fallbacks": self.fallbacks.get(name, 0)} for name in names}
+
+    def print_report(self):
+        report = self.report()
+        total = sum(item["llm_calls_avoided"] for item in report.values())
+        print(f"Fast-path extractors avoided {total} LLM calls")
+        for name, item in report.items():
+            print(f"  {name}: {item['llm_calls_avoided']} avoided, {item['llm_fallbacks']} sent to LLM")
+
+
+fast_path_stats = FastPathStats()
+
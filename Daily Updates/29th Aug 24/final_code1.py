@@ -1,62 +1,59 @@
-import pdfplumber
 import re
 import os
-import pandas as pd
 import time
-import docx2txt
 from pathlib import Path
-from ollama import Client
-from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
-import nltk
 import cProfile
 import pstats
-
-# Download the required NLTK resources
-nltk.download('stopwords')
-from nltk.corpus import stopwords
-
-# Initialize the LLM client
-client = Client()
-
-# Function to clean the extracted text by removing non-printable characters and stopwords
-def clean_text(text):
-    # Remove non-printable characters
-    text = ''.join(char for char in text if char.isprintable())
-    # Remove stopwords
-    stop_words = set(stopwords.words('english')).union(set(ENGLISH_STOP_WORDS))
-    cleaned_text = ' '.join(word for word in text.split() if word.lower() not in stop_words)
-    return cleaned_text
+from llm_cache import LLMCache, CachedClient, LazyClient
+from llm_schema import parse_and_validate
+import asyncio
+from async_dispatch import AsyncLLMDispatcher, map_in_threads, DEFAULT_MAX_IN_FLIGHT, DEFAULT_LLM_TIMEOUT
+from jd_session import JobDescriptionSession
+from resume_session import ResumeSession, session_prompt
+from resume_sections import routed_text, has_no_experience_section
+from generation_profiles import generation_kwargs
+from llm_telemetry import LLMMetrics, TelemetryClient, instrumented, extractor_scope, resume_scope
+from parsed_document import parse_document, parse_pdf, parse_docx, parse_txt, extractor_version, needs_ocr
+from ocr_queue import OCRQueue, run_ocr_queue
+from extraction_cache import ExtractionCache
+from archive_sources import ArchiveMember, is_archive, is_resume_file, iter_archive_members, source_name
+from result_store import ResultStore, FieldCheckpoint, checkpoint_context
+from staged_pipeline import run_two_stage_pipeline, iter_two_stage_pipeline, PipelineMetrics, DEFAULT_PARSE_WORKERS, DEFAULT_LLM_WORKERS, DEFAULT_QUEUE_SIZE
+from functools import partial
+from text_normalization import clean_text, clean_document, DEFAULT_CLEANING_PROFILE
+from fast_extractors import FAST_EXTRACTORS, CONFIDENCE_THRESHOLD, fast_path_stats
+
+# Initialize the LLM client behind the on-disk response cache so reruns reuse earlier answers,
+# and record per-call token counts and timings in the metrics database. ollama is only imported when a request
+# actually misses the cache.
+llm_cache = LLMCache('llm_cache.sqlite', max_bytes=512 * 1024 * 1024, max_age_seconds=30 * 24 * 3600)
+cached_client = CachedClient(LazyClient(), llm_cache)
+llm_metrics = LLMMetrics('llm_metrics.sqlite')
+client = TelemetryClient(cached_client, llm_metrics)
+
+# Parsed resume text and links keyed by file content, so re-scoring the same pool skips PDF parsing
+extraction_cache = ExtractionCache('extraction_cache.sqlite')
+# Documents without a text layer wait here for OCR instead of going to the LLM
+ocr_queue = OCRQueue('ocr_queue.sqlite')
+
+# Function to turn a parsed document into cleaned text lines (one entry per page)
+def document_lines(document):
+    return [clean_text(page) for page in document.pages if page]
 
 # Function to extract text from PDF files
 def extract_text_from_pdf(pdf_path):
-    text_data = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                cleaned_text = clean_text(page_text)
-                text_data.extend(cleaned_text.split('\n'))
-    return text_data
+    return document_lines(parse_pdf(pdf_path))
 
 # Function to extract text from .docx files
 def extract_text_from_docx(docx_path):
-    return clean_text(docx2txt.process(docx_path)).split('\n')
+    return document_lines(parse_docx(docx_path))
 
 # Function to extract text from .txt files
 def extract_text_from_txt(txt_path):
-    with open(txt_path, 'r', encoding='utf-8') as file:
-        return clean_text(file.read()).splitlines()
-
-# Function to clean text using regular expressions for better formatting
-def clean_text_column(text):
-    if isinstance(text, str):
-        text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
-        text = re.sub(r'(\d)([A-Z])', r'\1 \2', text)
-        text = re.sub(r'([A-Z])([A-Z][a-z])', r'\1 \2', text)
-        text = re.sub(r'(\d)([a-zA-Z])', r'\1 \2', text)
-    return text
+    return document_lines(parse_txt(txt_path))
 
 # Function to extract information using LLM prompt engineering
+@instrumented("extract_information_llm", parse_ok=lambda info: info["Name"] != "Not mentioned")
 def extract_information_llm(resume_text):
     if not isinstance(resume_text, str):
         return {"Name": "Not mentioned", "Location": "Not mentioned"}
@@ -71,7 +68,7 @@ def extract_information_llm(resume_text):
     - Location: [Extracted Location]
     """
 
-    response = client.generate(model="llama3:latest", prompt=prompt)
+    response = client.generate(model="llama3:latest", prompt=prompt, **generation_kwargs("extract_information_llm"))
     
     extracted_text = response.get('response', 'No response text found.')
     
@@ -90,6 +87,7 @@ def extract_information_llm(resume_text):
     return extracted_info
 
 # Function to extract phone number using LLM prompt engineering
+@instrumented("extract_phone_number", parse_ok=lambda phone: phone != "Not mentioned")
 def extract_phone_number(resume_text):
     if not isinstance(resume_text, str):
         return "Not mentioned"
@@ -103,7 +101,7 @@ def extract_phone_number(resume_text):
     - Phone Number: [Extracted Phone Number]
     """
 
-    response = client.generate(model="llama3:latest", prompt=prompt)
+    response = client.generate(model="llama3:latest", prompt=prompt, **generation_kwargs("extract_phone_number"))
     
     extracted_text = response.get('response', 'No response text found.')
     
@@ -120,52 +118,23 @@ def extract_phone_number(resume_text):
     
     return phone_number
 
-# Function to extract links using pdfplumber
-def extract_links_pdfplumber(pdf_path):
-    github_links = set()  # Use a set to ensure uniqueness
-    linkedin_links = set()  # Ensure LinkedIn links are unique
-
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            # Extracting annotations
-            if page.annots:
-                for annot in page.annots:
-                    if 'uri' in annot:
-                        url = annot['uri']
-                        if url:
-                            if 'github.com' in url:
-                                github_links.add(url)  # Add to set to remove duplicates
-                            elif 'linkedin.com' in url:
-                                linkedin_links.add(url)
-    
-    return list(github_links), list(linkedin_links)
-
-# Fallback function to extract links using regex if pdfplumber didn't find any
-def extract_links_regex(pdf_path):
-    github_links = set()
-    linkedin_links = set()
-
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            # Extract text and search for links using regex
-            page_text = page.extract_text()
-            if page_text:
-                # Regex to capture URLs
-                urls = re.findall(r'(https?://[^\s]+|www\.[^\s]+)', page_text)
-                for url in urls:
-                    if 'github.com' in url:
-                        github_links.add(url)
-                    elif 'linkedin.com' in url:
-                        linkedin_links.add(url)
-    
-    return list(github_links), list(linkedin_links)
-
 # Function to generate a fitment summary using LLM
-def fitment_summary(resume_text, job_description):
+# With a session (JD-primed and/or resume-primed) only the parts the session has not prefilled are sent
+@instrumented("fitment_summary", parse_ok=lambda summary: summary != "Not mentioned")
+def fitment_summary(resume_text, job_description, session=None):
     if not isinstance(resume_text, str) or not isinstance(job_description, str):
         return "Not mentioned"
-    
-    prompt = f"""
+
+    if session is not None:
+        task = """
+    Task: Based on the job description and resume, provide a summary of how this candidate is suitable for the role in 50 words.
+    Provide the fitment summary in this format:
+    - Summary: [50-word Summary]
+    """
+        response = session.generate(session_prompt(session, task, resume_text, job_description),
+                                    **generation_kwargs("fitment_summary"))
+    else:
+        prompt = f"""
     Based on the following resume and job description, provide a summary of how this candidate is suitable for the role in 50 words.
 
     Resume Text: {resume_text}
@@ -175,8 +144,7 @@ def fitment_summary(resume_text, job_description):
     Provide the fitment summary in this format:
     - Summary: [50-word Summary]
     """
-
-    response = client.generate(model="llama3:latest", prompt=prompt)
+        response = client.generate(model="llama3:latest", prompt=prompt, **generation_kwargs("fitment_summary"))
     
     extracted_text = response.get('response', 'No response text found.')
     
@@ -190,6 +158,7 @@ def fitment_summary(resume_text, job_description):
     return summary
 
 # Function to calculate total experience using LLM
+@instrumented("total_experience", parse_ok=lambda experience: experience != "Fresher or Not mentioned")
 def total_experience(resume_text):
     if not isinstance(resume_text, str):
         return "Fresher or Not mentioned"
@@ -203,7 +172,7 @@ def total_experience(resume_text):
     - Experience: [Total Experience in Years]
     """
 
-    response = client.generate(model="llama3:latest", prompt=prompt)
+    response = client.generate(model="llama3:latest", prompt=prompt, **generation_kwargs("total_experience"))
     
     extracted_text = response.get('response', 'No response text found.')
     
@@ -217,11 +186,20 @@ def total_experience(resume_text):
     return experience
 
 # Function to calculate a suitability score using LLM
-def calculate_score(resume_text, job_description):
+@instrumented("calculate_score")
+def calculate_score(resume_text, job_description, session=None):
     if not isinstance(resume_text, str) or not isinstance(job_description, str):
         return "Not mentioned"
 
-    prompt = f"""
+    if session is not None:
+        task = """
+    Task: Based on the job description, evaluate the suitability of the candidate described in the resume.
+    Provide a score from 1 to 100 on how suitable the candidate is for the job role.
+    Please respond with only the numerical score.
+    """
+        prompt = session_prompt(session, task, resume_text, job_description)
+    else:
+        prompt = f"""
     Based on the job description below, evaluate the suitability of the candidate described in the resume. 
     Provide a score from 1 to 100 on how suitable the candidate is for the job role.
 
@@ -235,13 +213,88 @@ def calculate_score(resume_text, job_description):
     """
 
     try:
-        response = client.generate(model="llama3:latest", prompt=prompt)
-        score = int(response['response'].strip())
-    except (ValueError, KeyError):
+        if session is not None:
+            response = session.generate(prompt, **generation_kwargs("calculate_score"))
+        else:
+            response = client.generate(model="llama3:latest", prompt=prompt, **generation_kwargs("calculate_score"))
+        # Take the first number in the answer so "Score: 85" or "85." still parse
+        score = int(re.search(r'\d{1,3}', response['response']).group(0))
+    except (ValueError, KeyError, AttributeError):
         score = None
 
     return score
 
+# JSON schema for the single-call profile extraction (name, location, phone and experience)
+PROFILE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": ["string", "null"]},
+        "location": {"type": ["string", "null"]},
+        "phone_number": {"type": ["string", "null"]},
+        "total_experience_years": {"type": ["number", "null"], "minimum": 0},
+    },
+    "required": ["name", "location", "phone_number", "total_experience_years"],
+}
+# The same call when the fast path already found the phone number: the model is not asked for it
+PROFILE_SCHEMA_WITHOUT_PHONE = {
+    "type": "object",
+    "properties": {name: spec for name, spec in PROFILE_SCHEMA["properties"].items() if name != "phone_number"},
+    "required": [name for name in PROFILE_SCHEMA["required"] if name != "phone_number"],
+}
+
+# Function to turn an empty or "none"-like model value into the sheet's placeholder
+def value_or_placeholder(value, placeholder="Not mentioned"):
+    if value is None:
+        return placeholder
+    value = str(value).strip()
+    if not value or value.lower() in ("none", "null", "n/a", "not mentioned"):
+        return placeholder
+    return value
+
+# Function to extract name, location, phone number and total experience in one structured LLM call
+# Returns None when the answer does not validate so the caller can fall back to the per-field extractors.
+# With known_phone (a confident fast-path match) the phone number is left out of the question and returned as is.
+@instrumented("extract_profile_structured")
+def extract_profile_structured(resume_text, session=None, known_phone=None):
+    if not isinstance(resume_text, str):
+        return None
+
+    phone_line = "" if known_phone else """
+    - phone_number: the phone number exactly as written, in any local or international format"""
+    task = f"""
+    Extract the candidate's details from the resume and answer with a JSON object.
+    - name: the candidate's full name (it may appear anywhere and may be capitalized)
+    - location: the candidate's city/state/country{phone_line}
+    - total_experience_years: total years of work experience from the work experience section, or 0 for a fresher
+    Use null for anything that is not mentioned.
+    """
+    schema = PROFILE_SCHEMA_WITHOUT_PHONE if known_phone else PROFILE_SCHEMA
+
+    if session is not None:
+        response = session.generate(session_prompt(session, task, resume_text), format=schema,
+                                    **generation_kwargs("extract_profile_structured"))
+    else:
+        prompt = f"{task}\n    Resume Text: {resume_text}\n    "
+        response = client.generate(model="llama3:latest", prompt=prompt, format=schema,
+                                   **generation_kwargs("extract_profile_structured"))
+    data, errors = parse_and_validate(response.get('response', ''), schema)
+    if data is None:
+        print(f"Structured extraction failed validation: {'; '.join(errors)}")
+        return None
+
+    years = data["total_experience_years"]
+    if not years:
+        experience = "Fresher or Not mentioned"
+    else:
+        experience = f"{years:g} years"
+
+    return {
+        "Name": value_or_placeholder(data["name"]),
+        "Location": value_or_placeholder(data["location"]),
+        "Phone Number": known_phone or value_or_placeholder(data["phone_number"]),
+        "Total Experience": experience,
+    }
+
 
 # Function to extract text from different file types
 def extract_text_from_file(file_path):
@@ -256,9 +309,14 @@ def extract_text_from_file(file_path):
         return []
 
 # Function to evaluate candidate's resume against the extracted skills
-def evaluate_candidate(skill, resume_text):
-    prompt = f"Does the candidate have the skill '{skill}'? If so, briefly describe their experience with it in 50-100 words.\n\nCandidate Resume:\n{resume_text}"
-    response = client.generate(model='llama3:latest', prompt=prompt)
+@instrumented("evaluate_candidate", parse_ok=lambda observation: True)
+def evaluate_candidate(skill, resume_text, session=None):
+    task = f"Does the candidate have the skill '{skill}'? If so, briefly describe their experience with it in 50-100 words."
+    if session is not None:
+        response = session.generate(session_prompt(session, task, resume_text), **generation_kwargs("evaluate_candidate"))
+    else:
+        prompt = f"{task}\n\nCandidate Resume:\n{resume_text}"
+        response = client.generate(model='llama3:latest', prompt=prompt, **generation_kwargs("evaluate_candidate"))
     result = response.get('response', "Not mentioned")
     
     # Check if the skill is mentioned in the response, otherwise return "Not mentioned"
@@ -266,8 +324,434 @@ def evaluate_candidate(skill, resume_text):
         return "Not mentioned"
     return result
 
+# Context window requested for batched calls and the rough output budget per skill (50-100 words)
+SKILL_BATCH_NUM_CTX = 8192
+SKILL_OUTPUT_TOKENS = 160
+SKILL_PROMPT_OVERHEAD_TOKENS = 200
+
+# JSON schema for the batched skill evaluation; skills are addressed by their index in the batch
+SKILLS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "skills": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer", "minimum": 0},
+                    "has_skill": {"type": "boolean"},
+                    "observation": {"type": "string"},
+                },
+                "required": ["id", "has_skill", "observation"],
+            },
+        },
+    },
+    "required": ["skills"],
+}
+
+# Function to roughly estimate the token count of a text (about 4 characters per llama3 token)
+def estimate_tokens(text):
+    return len(text) // 4 + 1
+
+# Function to split the skill list so the expected answer of each chunk fits in the context window
+def chunk_skills(skills, resume_text, num_ctx=SKILL_BATCH_NUM_CTX):
+    skill_tokens = sum(estimate_tokens(str(skill)) for skill in skills)
+    available = num_ctx - estimate_tokens(resume_text) - skill_tokens - SKILL_PROMPT_OVERHEAD_TOKENS
+    chunk_size = max(1, available // SKILL_OUTPUT_TOKENS)
+    return [skills[i:i + chunk_size] for i in range(0, len(skills), chunk_size)]
+
+# Function to evaluate one chunk of skills in a single structured call; returns {skill: observation}
+@instrumented("evaluate_skill_chunk", parse_ok=bool)
+def evaluate_skill_chunk(skills, resume_text, num_ctx=SKILL_BATCH_NUM_CTX, session=None):
+    skill_lines = "\n".join(f"{i}. {skill}" for i, skill in enumerate(skills))
+    task = f"""
+    For each numbered skill below, decide whether the candidate has the skill. If so, briefly describe their experience with it in 50-100 words; otherwise use an empty observation.
+    Answer with a JSON object containing a "skills" array with one entry per skill: id (the skill number), has_skill and observation.
+
+    Skills:
+    {skill_lines}
+    """
+    generation = generation_kwargs("evaluate_skill_chunk",
+                                   {"num_ctx": num_ctx, "num_predict": SKILL_OUTPUT_TOKENS * len(skills) + 50})
+
+    if session is not None:
+        response = session.generate(session_prompt(session, task, resume_text), format=SKILLS_SCHEMA, **generation)
+    else:
+        prompt = f"{task}\n    Candidate Resume:\n    {resume_text}\n    "
+        response = client.generate(model="llama3:latest", prompt=prompt, format=SKILLS_SCHEMA, **generation)
+    data, errors = parse_and_validate(response.get('response', ''), SKILLS_SCHEMA)
+    if data is None:
+        return {}
+
+    observations = {}
+    for item in data["skills"]:
+        if item["id"] >= len(skills):
+            continue
+        observation = item["observation"].strip()
+        if not item["has_skill"] or not observation or "not mentioned" in observation.lower():
+            observations[skills[item["id"]]] = "Not mentioned"
+        else:
+            observations[skills[item["id"]]] = observation
+    return observations
+
+# Function to evaluate all skills for a resume in as few calls as possible
+# Chunks that come back invalid or incomplete are split in half and retried; single skills fall back to evaluate_candidate
+# With a checkpoint, skills already answered are taken from it and every new observation is saved as it arrives
+def evaluate_skills_batched(skills, resume_text, num_ctx=SKILL_BATCH_NUM_CTX, session=None, checkpoint=None):
+    if not isinstance(resume_text, str):
+        return {skill: "Not mentioned" for skill in skills}
+
+    results = {}
+    if checkpoint is not None:
+        results = {skill: checkpoint.get(skill_field(skill)) for skill in skills if skill_field(skill) in checkpoint}
+
+    def record(skill, observation):
+        results[skill] = observation
+        if checkpoint is not None:
+            checkpoint.put(skill_field(skill), observation)
+
+    pending = chunk_skills([skill for skill in skills if skill not in results], resume_text, num_ctx)
+    while pending:
+        chunk = pending.pop(0)
+        if len(chunk) == 1:
+            observations = evaluate_skill_chunk(chunk, resume_text, num_ctx, session=session)
+            record(chunk[0], observations.get(chunk[0]) or evaluate_candidate(chunk[0], resume_text, session=session))
+            continue
+        observations = evaluate_skill_chunk(chunk, resume_text, num_ctx, session=session)
+        for skill, observation in observations.items():
+            record(skill, observation)
+        missing = [skill for skill in chunk if skill not in observations]
+        if missing:
+            middle = (len(missing) + 1) // 2
+            pending[:0] = [part for part in (missing[:middle], missing[middle:]) if part]
+    return results
+
+# Checkpoint field of one skill's observation
+def skill_field(skill):
+    return f"skill:{skill}"
+
+# Resume sections each extractor consumes (see resume_sections.py); None means the whole resume
+EXTRACTOR_SECTIONS = {
+    "extract_information_llm": ("header", "contact"),
+    "extract_phone_number": ("header", "contact"),
+    "total_experience": ("experience",),
+    "extract_profile_structured": ("header", "contact", "experience"),
+    "fitment_summary": None,
+    "calculate_score": None,
+    "evaluate_skills_batched": None,
+}
+
+# Function to get the part of the resume a given extractor needs
+def text_for(extractor, cleaned_text):
+    return routed_text(cleaned_text, EXTRACTOR_SECTIONS.get(extractor))
+
+# Output column for each profile link category
+PROFILE_LINK_COLUMNS = {
+    "github": "Github Links",
+    "linkedin": "LinkedIn Links",
+    "gitlab": "GitLab Links",
+    "kaggle": "Kaggle Links",
+    "portfolio": "Portfolio Links",
+}
+
+# Function to do the CPU-side work for one resume: parse, clean, and everything that needs no LLM
+# Returns a plain dict so the staged pipeline can run this in a worker process
+def prepare_resume(source, pdf_backend=None, cleaning_profile=DEFAULT_CLEANING_PROFILE):
+    # Archive members arrive as in-memory bytes; everything else is a path on disk
+    if isinstance(source, ArchiveMember):
+        file_path, data = source
+    else:
+        file_path, data = source, None
+
+    # Open the file once: page text, annotation links and URLs in the text all come from this pass
+    version = extractor_version(pdf_backend)
+    document = extraction_cache.load(file_path, lambda: parse_document(file_path, pdf_backend, data), version, data=data)
+
+    # Scanned or empty documents would only get hallucinated answers; park them for OCR instead
+    ocr_reason = needs_ocr(document)
+    if ocr_reason:
+        ocr_queue.add(document.content_hash, source_name(source), file_path, ocr_reason, version, data)
+        return {"file_path": file_path, "filename": source_name(source), "quarantined": ocr_reason}
+
+    # Text for the LLM prompts: by default compressed (glyphs, repeated lines and whitespace removed,
+    # dates normalized) rather than stopword-stripped, see text_normalization.CLEANING_PROFILES
+    cleaned_text = clean_document(document.pages, cleaning_profile)
+
+    # Phone numbers and e-mails are regular enough for regexes; a confident phone match means the model is not asked.
+    # They run on the text as extracted: cleaning removes the line breaks, gluing a name to the e-mail below it
+    # or a phone number to the digits next to it.
+    raw_text = document.text
+    fast_phone = FAST_EXTRACTORS['phone'](raw_text)
+
+    # GitHub, LinkedIn, GitLab, Kaggle and portfolio links from PDF annotations and the text, normalized so the
+    # same profile written two ways is reported once
+    profile_links = document.profile_links()
+
+    return {
+        "file_path": file_path,
+        "filename": source_name(source),
+        # Identifies the document whatever it is called, for the field checkpoints
+        "content_hash": document.content_hash,
+        "cleaned_text": cleaned_text,
+        # A resume with clear sections but no work-history section is a fresher; no need to ask the model
+        "no_experience": has_no_experience_section(cleaned_text),
+        "fast_phone": fast_phone["value"] if fast_phone["confidence"] >= CONFIDENCE_THRESHOLD else None,
+        "email": FAST_EXTRACTORS['email'](raw_text)["value"] or "Not mentioned",
+        "profile_links": profile_links,
+    }
+
+# Function to extract, clean and run every LLM extractor for a single resume
+def process_resume(source, job_description_text, skills, structured_extraction=True, batched_skills=True,
+                   jd_session=None, resume_sessions=True, pdf_backend=None, cleaning_profile=DEFAULT_CLEANING_PROFILE,
+                   checkpoints=None, checkpoint_key=""):
+    prepared = prepare_resume(source, pdf_backend, cleaning_profile)
+    return analyze_resume(prepared, job_description_text, skills, structured_extraction=structured_extraction,
+                          batched_skills=batched_skills, jd_session=jd_session, resume_sessions=resume_sessions,
+                          checkpoints=checkpoints, checkpoint_key=checkpoint_key)
+
+# Function to run the LLM extractors on a resume already handled by prepare_resume
+# Returns None, without any LLM call, for a document quarantined for OCR or already processed under another name.
+# With checkpoints (a ResultStore), every answer is saved under the document's content hash and checkpoint_key
+# as soon as it arrives, and answers saved by an interrupted run are reused instead of asked again.
+def analyze_resume(prepared, job_description_text, skills, structured_extraction=True, batched_skills=True,
+                   jd_session=None, resume_sessions=True, checkpoints=None, checkpoint_key=""):
+    filename = prepared["filename"]
+    if prepared.get("quarantined"):
+        print(f"Quarantined for OCR: {filename} ({prepared['quarantined']})")
+        return None
+
+    checkpoint = FieldCheckpoint(checkpoints, prepared["content_hash"], checkpoint_key)
+    finished = checkpoint.get("row")
+    if finished is not None:
+        # Same file: the run stopped between finishing the row and saving it. Another name: a renamed or re-uploaded copy.
+        if finished["Filename"] == filename:
+            return finished
+        print(f"Skipping {filename}: same document as already processed {finished['Filename']}")
+        return None
+    if checkpoint.resumed:
+        print(f"Resuming {filename}: {checkpoint.resumed} fields from checkpoint")
+
+    cleaned_text = prepared["cleaned_text"]
+    no_experience = prepared["no_experience"]
+
+    # Attribute every LLM call below to this resume in the telemetry
+    with resume_scope(filename):
+        # Prefill the resume once and ask every question below as a follow-up on that context
+        session = ResumeSession(client, cleaned_text, jd_session=jd_session) if resume_sessions else jd_session
+        if resume_sessions:
+            with extractor_scope("resume_session_prime"):
+                session.ensure_primed()
+
+        # Extract Name, Location, Phone Number and Total Experience in one structured call,
+        # falling back to the per-field prompts if the answer does not validate.
+        # Without a resume session each prompt only carries the sections its extractor consumes.
+        # A confident fast-path phone number is used as is and the model is not asked for one.
+        fast_phone = prepared["fast_phone"]
+        profile = None
+        if structured_extraction:
+            profile = checkpoint.get_or_compute("profile", lambda: extract_profile_structured(
+                text_for("extract_profile_structured", cleaned_text), session=session, known_phone=fast_phone))
+        if profile is None:
+            extracted_info = checkpoint.get_or_compute("information", lambda: extract_information_llm(
+                text_for("extract_information_llm", cleaned_text)))
+            # Only here does the fast path save a whole call; a checkpointed answer saves nothing either way
+            if fast_phone:
+                fast_path_stats.record('phone', True)
+                phone = fast_phone
+            else:
+                if "phone" not in checkpoint:
+                    fast_path_stats.record('phone', False)
+                phone = checkpoint.get_or_compute("phone", lambda: extract_phone_number(
+                    text_for("extract_phone_number", cleaned_text)))
+            profile = {
+                "Name": extracted_info["Name"],
+                "Location": extracted_info["Location"],
+                "Phone Number": phone,
+                "Total Experience": ("Fresher or Not mentioned" if no_experience
+                                     else checkpoint.get_or_compute("total_experience", lambda: total_experience(
+                                         text_for("total_experience", cleaned_text)))),
+            }
+        email = prepared["email"]
+
+        # Generate Fitment Summary
+        summary = checkpoint.get_or_compute(
+            "fitment_summary", lambda: fitment_summary(cleaned_text, job_description_text, session=session))
+
+        # Calculate Suitability Score
+        score = checkpoint.get_or_compute(
+            "score", lambda: calculate_score(cleaned_text, job_description_text, session=session))
+
+        # Initialize a dictionary to store all extracted information
+        extracted_data = {
+            "Filename": filename,
+            "Name": profile["Name"],
+            "Location": profile["Location"],
+            "Phone Number": profile["Phone Number"],
+            "Email": email,
+        }
+        # Join multiple links into a single string (comma-separated)
+        for category, column in PROFILE_LINK_COLUMNS.items():
+            links = prepared["profile_links"][category]
+            extracted_data[column] = ', '.join(links) if links else "Not mentioned"
+        extracted_data.update({
+            "Total Experience": profile["Total Experience"],
+            "Fitment Summary": summary,
+            "Score": score
+        })
+
+        # Generate candidate observations for each skill, batching several skills per LLM call
+        if batched_skills:
+            observations = evaluate_skills_batched(skills, cleaned_text, session=session, checkpoint=checkpoint)
+            for skill in skills:
+                extracted_data[skill] = observations.get(skill, "Not mentioned")
+        else:
+            for skill in skills:
+                observation = checkpoint.get_or_compute(
+                    skill_field(skill), lambda: evaluate_candidate(skill, cleaned_text, session=session))
+                extracted_data[skill] = observation
+
+        # The finished row marks the document as done, under any file name
+        checkpoint.put("row", extracted_data)
+        return extracted_data
+
+# Function to run process_resume for all files through the asyncio dispatcher
+# LLM requests go out on ollama.AsyncClient with at most max_in_flight at a time; parsing runs in worker threads
+# meanwhile. Rows are returned in the order of file_paths; as each one finishes it is handed to on_row(index, row),
+# with index its position in file_paths, so the caller can save it and still restore the file order.
+async def process_resumes_async(file_paths, job_description_text, skills, on_row, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                                llm_timeout=DEFAULT_LLM_TIMEOUT, **resume_options):
+    loop = asyncio.get_running_loop()
+    dispatcher = AsyncLLMDispatcher(max_in_flight=max_in_flight, timeout=llm_timeout)
+    transport = cached_client.client
+    cached_client.client = dispatcher.bridge(loop)
+
+    def run(source):
+        print(f"Processing: {source_name(source)}")
+        return process_resume(source, job_description_text, skills, **resume_options)
+
+    names = {}
+
+    def collect(index, result):
+        if isinstance(result, BaseException):
+            print(f"Failed: {names[index]} ({type(result).__name__}: {result})")
+            return
+        if result is None:
+            return
+        on_row(index, result)
+
+    try:
+        # Keep a few more resumes active than LLM slots so text extraction overlaps with model calls
+        results = await map_in_threads(run, remember_names(file_paths, names), max_workers=max_in_flight + 2,
+                                       on_result=collect)
+    except asyncio.CancelledError:
+        dispatcher.cancel_all()
+        raise
+    finally:
+        cached_client.client = transport
+    print(f"Async dispatcher: {dispatcher.completed} LLM calls, {dispatcher.timed_out} timed out")
+    return [result for result in results if result is not None and not isinstance(result, BaseException)]
+
+# Function to run the resumes through the two-stage pipeline: parse_workers processes parse and clean,
+# llm_workers threads run the LLM extractors on whatever has been parsed so far
+def process_resumes_staged(file_paths, job_description_text, skills, on_row, parse_workers=DEFAULT_PARSE_WORKERS,
+                           llm_workers=DEFAULT_LLM_WORKERS, queue_size=DEFAULT_QUEUE_SIZE, pdf_backend=None,
+                           cleaning_profile=DEFAULT_CLEANING_PROFILE, **resume_options):
+    def analyze(prepared):
+        print(f"Processing: {prepared['filename']}")
+        return analyze_resume(prepared, job_description_text, skills, **resume_options)
+
+    names = {}
+
+    def collect(index, result):
+        if isinstance(result, BaseException):
+            print(f"Failed: {names[index]} ({type(result).__name__}: {result})")
+            return
+        if result is None:
+            return
+        on_row(index, result)
+
+    prepare = partial(prepare_resume, pdf_backend=pdf_backend, cleaning_profile=cleaning_profile)
+    results, metrics = run_two_stage_pipeline(remember_names(file_paths, names), prepare, analyze,
+                                              on_result=collect, parse_workers=parse_workers,
+                                              llm_workers=llm_workers, queue_size=queue_size)
+    metrics.print_report()
+    return [result for result in results if result is not None and not isinstance(result, BaseException)]
+
+# Function to pass sources through unchanged while recording their names by position, for failure messages
+def remember_names(sources, names):
+    for index, source in enumerate(sources):
+        names[index] = source_name(source)
+        yield source
+
+# Function to yield the resumes in a folder that still need processing, in file name order
+# Only the listing is read up front; archive members are read one at a time as they are consumed
+def iter_sorted_resume_files(resume_folder, processed_files=()):
+    if os.path.isfile(resume_folder):
+        yield from iter_archive_members(resume_folder, processed_files)
+        return
+    for filename in sorted(os.listdir(resume_folder)):
+        if filename in processed_files:
+            print(f"Skipping already processed file: {filename}")
+            continue  # Skip the already processed files
+        if is_archive(filename):
+            yield from iter_archive_members(os.path.join(resume_folder, filename), processed_files)
+        elif is_resume_file(filename):
+            yield os.path.join(resume_folder, filename)
+
+# Function to lazily yield the resumes in a folder that still need processing
+# os.scandir reads the directory incrementally, so no list of the whole folder is ever built.
+# .zip/.tar(.gz) exports in the folder (or passed as resume_folder) yield their members straight from memory.
+def iter_resume_files(resume_folder, processed_files=()):
+    if os.path.isfile(resume_folder) and is_archive(resume_folder):
+        yield from iter_archive_members(resume_folder, processed_files)
+        return
+    with os.scandir(resume_folder) as entries:
+        for entry in entries:
+            if entry.name in processed_files or not entry.is_file():
+                continue  # Skip the already processed files
+            if is_archive(entry.name):
+                yield from iter_archive_members(entry.path, processed_files)
+            elif is_resume_file(entry.name):
+                yield entry.path
+
+# Function to process any number of sources in constant memory: sources is consumed lazily (e.g. from
+# iter_resume_files), only the pipeline's in-flight window is held at once, and every row is handed to
+# on_row(index, row) as soon as it is ready
+def stream_resumes(sources, job_description_text, skills, on_row,
+                   parse_workers=DEFAULT_PARSE_WORKERS, llm_workers=DEFAULT_LLM_WORKERS,
+                   queue_size=DEFAULT_QUEUE_SIZE, pdf_backend=None, cleaning_profile=DEFAULT_CLEANING_PROFILE,
+                   **resume_options):
+    def analyze(prepared):
+        return analyze_resume(prepared, job_description_text, skills, **resume_options)
+
+    metrics = PipelineMetrics(parse_workers, llm_workers, queue_size)
+    written = 0
+    prepare = partial(prepare_resume, pdf_backend=pdf_backend, cleaning_profile=cleaning_profile)
+    rows = iter_two_stage_pipeline(sources, prepare, analyze,
+                                   parse_workers=parse_workers, llm_workers=llm_workers,
+                                   queue_size=queue_size, metrics=metrics)
+    for index, source, result in rows:
+        if isinstance(result, BaseException):
+            print(f"Failed: {source_name(source)} ({type(result).__name__}: {result})")
+            continue
+        if result is None:
+            continue
+        on_row(index, result)
+        written += 1
+        print(f"Processed: {source_name(source)} ({written} rows written)")
+    metrics.print_report()
+    return written
+
 # Main function to extract, clean, and process resumes
-def pdfs_to_cleaned_and_extracted_excel(resume_folder, job_description_file, skills_file, final_excel_path):
+def pdfs_to_cleaned_and_extracted_excel(resume_folder, job_description_file, skills_file, final_excel_path,
+                                        structured_extraction=True, batched_skills=True, execution_mode="sync",
+                                        max_in_flight=DEFAULT_MAX_IN_FLIGHT, llm_timeout=DEFAULT_LLM_TIMEOUT,
+                                        jd_primed=True, resume_sessions=True, pdf_backend=None,
+                                        parse_workers=DEFAULT_PARSE_WORKERS, llm_workers=DEFAULT_LLM_WORKERS,
+                                        handoff_queue_size=DEFAULT_QUEUE_SIZE, export_excel=True, ocr_scanned=False,
+                                        cleaning_profile=DEFAULT_CLEANING_PROFILE):
+    import pandas as pd
+
     # Load existing data if the Excel file already exists
     if os.path.exists(final_excel_path):
         df_existing = pd.read_excel(final_excel_path)
@@ -276,7 +760,12 @@ def pdfs_to_cleaned_and_extracted_excel(resume_folder, job_description_file, ski
         df_existing = pd.DataFrame()
         processed_files = set()
 
-    all_extracted_data = []
+    # Every finished row is appended to a journal next to the workbook (one fsynced SQLite insert), so saving
+    # progress costs the same for the first and the last resume; the workbook itself is written once, at the end.
+    # Files already in the journal (e.g. from an interrupted run) are skipped like the ones in the workbook.
+    # The journal also holds the field checkpoints, see analyze_resume.
+    results = ResultStore(os.path.splitext(final_excel_path)[0] + '.results.sqlite')
+    processed_files |= results.filenames()
 
     # Extract the job description text
     job_description_text = "\n".join(extract_text_from_file(job_description_file))
@@ -285,79 +774,82 @@ def pdfs_to_cleaned_and_extracted_excel(resume_folder, job_description_file, ski
     skills_df = pd.read_excel(skills_file)
     skills = skills_df['Skills'].tolist()  # Assuming the column is named 'Skills'
 
-    # Record the start time
-    start_time = time.time()
-
-    # Loop through all files in the specified folder
-    for filename in os.listdir(resume_folder):
-        if filename in processed_files:
-            print(f"Skipping already processed file: {filename}")
-            continue  # Skip the already processed files
-
-        if filename.endswith((".pdf", ".docx", ".txt")):
-            file_path = os.path.join(resume_folder, filename)
-            print(f"Processing: {filename}")
+    # Prefill the job description once per batch and reuse it for the summary and score prompts
+    jd_session = JobDescriptionSession(client, job_description_text) if jd_primed else None
+    if jd_session is not None:
+        with extractor_scope("jd_session_prime"):
+            jd_session.ensure_primed()
 
-            # Extract text from the current file
-            resume_text = "\n".join(extract_text_from_file(file_path))
+    resume_options = {"structured_extraction": structured_extraction, "batched_skills": batched_skills,
+                      "jd_session": jd_session, "resume_sessions": resume_sessions, "pdf_backend": pdf_backend,
+                      "cleaning_profile": cleaning_profile, "checkpoints": results,
+                      "checkpoint_key": checkpoint_context(job_description_text, skills, structured_extraction,
+                                                           batched_skills, jd_primed, resume_sessions, pdf_backend,
+                                                           cleaning_profile)}
 
-            # Clean the extracted text
-            cleaned_text = clean_text_column(resume_text)
-
-            # Extract Name and Location using LLM
-            extracted_info = extract_information_llm(cleaned_text)
-
-            # Extract Phone Number
-            phone_number = extract_phone_number(cleaned_text)
-
-            # Extract GitHub and LinkedIn links using pdfplumber, with regex fallback
-            github_links, linkedin_links = extract_links_pdfplumber(file_path)
-            if not github_links and not linkedin_links:
-                github_links, linkedin_links = extract_links_regex(file_path)
-
-            # Generate Fitment Summary
-            summary = fitment_summary(cleaned_text, job_description_text)
-
-            # Calculate Total Experience
-            experience = total_experience(cleaned_text)
-
-            # Calculate Suitability Score
-            score = calculate_score(cleaned_text, job_description_text)
-
-            # Join multiple links into a single string (comma-separated)
-            github_links_str = ', '.join(github_links) if github_links else "Not mentioned"
-            linkedin_links_str = ', '.join(linkedin_links) if linkedin_links else "Not mentioned"
-
-            # Initialize a dictionary to store all extracted information
-            extracted_data = {
-                "Filename": filename,
-                "Name": extracted_info["Name"],
-                "Location": extracted_info["Location"],
-                "Phone Number": phone_number,
-                "Github Links": github_links_str,
-                "LinkedIn Links": linkedin_links_str,
-                "Total Experience": experience,
-                "Fitment Summary": summary,
-                "Score": score
-            }
-
-            # Generate candidate observations for each skill
-            for skill in skills:
-                observation = evaluate_candidate(skill, cleaned_text)
-                extracted_data[skill] = observation
+    # Record the start time
+    start_time = time.time()
 
-            # Append the extracted data to the list
-            all_extracted_data.append(extracted_data)
+    # Function to save a finished row with its source's position, so the workbook keeps the file order
+    # whatever order the workers finish in
+    def save_row(index, row):
+        results.append(row, position=index)
+
+    # Function to run a batch of sources through the selected execution mode, saving each row as it finishes
+    def run_sources(sources):
+        if execution_mode == "stream":
+            stream_resumes(sources, job_description_text, skills, save_row, parse_workers=parse_workers,
+                           llm_workers=llm_workers, queue_size=handoff_queue_size, **resume_options)
+        elif execution_mode == "async":
+            asyncio.run(process_resumes_async(sources, job_description_text, skills, save_row,
+                                              max_in_flight=max_in_flight, llm_timeout=llm_timeout,
+                                              **resume_options))
+        elif execution_mode == "pipeline":
+            process_resumes_staged(sources, job_description_text, skills, save_row,
+                                   parse_workers=parse_workers, llm_workers=llm_workers,
+                                   queue_size=handoff_queue_size, **resume_options)
+        else:
+            for index, source in enumerate(sources):
+                print(f"Processing: {source_name(source)}")
+                row = process_resume(source, job_description_text, skills, **resume_options)
+                if row is None:
+                    continue  # Quarantined for OCR, or a copy of a document already processed
+
+                # Save progress after each resume
+                save_row(index, row)
+
+    # The files that still need processing, found as they are consumed; archive exports contribute their
+    # members, each read into memory only when its turn comes, named "<archive>:<member path>".
+    # Stream mode does not sort the folder listing, so it never holds the whole of it.
+    if execution_mode == "stream":
+        run_sources(iter_resume_files(resume_folder, processed_files))
+    else:
+        run_sources(iter_sorted_resume_files(resume_folder, processed_files))
+
+    # Optional local OCR of the quarantined documents; their text lands in the extraction cache,
+    # so they then go through the pipeline like any other resume
+    if ocr_scanned:
+        ready = run_ocr_queue(ocr_queue, extraction_cache)
+        # A run of its own, so these rows follow the main batch in the workbook
+        results.new_run()
+        run_sources([ArchiveMember(entry["filename"], entry["data"]) if entry["data"] is not None else entry["path"]
+                     for entry in ready])
+
+    # One workbook write for the whole batch; with export_excel=False the rows stay in the journal until
+    # `python result_store.py <workbook> --store <journal>` exports them
+    if export_excel:
+        results.export_excel(final_excel_path, df_existing)
 
-            # Save progress after each resume
-            df_progress = pd.DataFrame(all_extracted_data)
-            df_combined = pd.concat([df_existing, df_progress], ignore_index=True)
-            df_combined.to_excel(final_excel_path, index=False)
-    
     # Record the end time and calculate elapsed time
     end_time = time.time()
     elapsed_time = end_time - start_time
     print(f"Process completed in {elapsed_time:.2f} seconds.")
+    client.print_stats()
+    results.print_stats()
+    extraction_cache.print_stats()
+    ocr_queue.print_stats()
+    fast_path_stats.print_report()
+    llm_metrics.print_report()
 
 # Profile the main function
 def main():
@@ -5,24 +5,22 @@ import pandas as pd
 import time
 import docx2txt
 from pathlib import Path
-from ollama import Client
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
-import nltk
+from llm_cache import LazyClient
+from result_store import ResultStore, FieldCheckpoint, checkpoint_context
+from extraction_cache import file_sha256
+# NLTK + scikit-learn stopwords, vendored so startup needs no nltk.download()
+from english_stopwords import ENGLISH_STOP_WORDS
 
-# Download the required NLTK resources
-nltk.download('stopwords')
-from nltk.corpus import stopwords
-
-# Initialize the LLM client
-client = Client()
+# Initialize the LLM client (ollama is imported on the first request)
+client = LazyClient()
 
 # Function to clean the extracted text by removing non-printable characters and stopwords
 def clean_text(text):
     # Remove non-printable characters
     text = ''.join(char for char in text if char.isprintable())
     # Remove stopwords
-    stop_words = set(stopwords.words('english')).union(set(ENGLISH_STOP_WORDS))
+    stop_words = ENGLISH_STOP_WORDS
     cleaned_text = ' '.join(word for word in text.split() if word.lower() not in stop_words)
     return cleaned_text
 
@@ -267,23 +265,33 @@ def evaluate_candidate(skill, resume_text):
 
 # Main function to extract, clean, and process resumes
 
-def process_resume(file_path, job_description_text, skills, processed_files):
+def process_resume(file_path, job_description_text, skills, processed_files, checkpoints=None, checkpoint_key=""):
     if os.path.basename(file_path) in processed_files:
         return None  # Skip if already processed
 
+    # Every LLM answer is saved under the file's content hash as soon as it arrives, so a crashed run
+    # continues where it stopped and a renamed copy of a processed file is recognized
+    checkpoint = FieldCheckpoint(checkpoints, file_sha256(file_path), checkpoint_key)
+    finished = checkpoint.get("row")
+    if finished is not None:
+        if finished["Filename"] == os.path.basename(file_path):
+            return finished
+        print(f"Skipping {os.path.basename(file_path)}: same document as already processed {finished['Filename']}")
+        return None
+
     # Extract text from the file
     resume_text = "\n".join(extract_text_from_file(file_path))
     cleaned_text = clean_text_column(resume_text)
 
     # Extract information and links
-    extracted_info = extract_information_llm(cleaned_text)
-    phone_number = extract_phone_number(cleaned_text)
+    extracted_info = checkpoint.get_or_compute("information", lambda: extract_information_llm(cleaned_text))
+    phone_number = checkpoint.get_or_compute("phone", lambda: extract_phone_number(cleaned_text))
     github_links, linkedin_links = extract_links_pdfplumber(file_path)
     if not github_links and not linkedin_links:
         github_links, linkedin_links = extract_links_regex(file_path)
-    summary = fitment_summary(cleaned_text, job_description_text)
-    experience = total_experience(cleaned_text)
-    score = calculate_score(cleaned_text, job_description_text)
+    summary = checkpoint.get_or_compute("fitment_summary", lambda: fitment_summary(cleaned_text, job_description_text))
+    experience = checkpoint.get_or_compute("total_experience", lambda: total_experience(cleaned_text))
+    score = checkpoint.get_or_compute("score", lambda: calculate_score(cleaned_text, job_description_text))
 
     # Join multiple links into a single string (comma-separated)
     github_links_str = ', '.join(github_links) if github_links else "Not mentioned"
@@ -304,9 +312,10 @@ def process_resume(file_path, job_description_text, skills, processed_files):
 
     # Generate candidate observations for each skill
     for skill in skills:
-        observation = evaluate_candidate(skill, cleaned_text)
+        observation = checkpoint.get_or_compute(f"skill:{skill}", lambda: evaluate_candidate(skill, cleaned_text))
         extracted_data[skill] = observation
 
+    checkpoint.put("row", extracted_data)
     return extracted_data
 
 def pdfs_to_cleaned_and_extracted_excel(resume_folder, job_description_file, skills_file, final_excel_path):
@@ -317,7 +326,9 @@ def pdfs_to_cleaned_and_extracted_excel(resume_folder, job_description_file, ski
         df_existing = pd.DataFrame()
         processed_files = set()
 
-    all_extracted_data = []
+    # Finished rows and field checkpoints go to a journal next to the workbook as they complete
+    results = ResultStore(os.path.splitext(final_excel_path)[0] + '.results.sqlite')
+    processed_files |= results.filenames()
 
     # Extract the job description text
     job_description_text = "\n".join(extract_text_from_file(job_description_file))
@@ -325,6 +336,7 @@ def pdfs_to_cleaned_and_extracted_excel(resume_folder, job_description_file, ski
     # Load skills and requirements from the provided Excel sheet
     skills_df = pd.read_excel(skills_file)
     skills = skills_df['Skills'].tolist()
+    checkpoint_key = checkpoint_context(job_description_text, skills)
 
     # Record the start time
     start_time = time.time()
@@ -335,18 +347,18 @@ def pdfs_to_cleaned_and_extracted_excel(resume_folder, job_description_file, ski
 
     # Use ThreadPoolExecutor to parallelize the processing
     with ThreadPoolExecutor() as executor:
-        futures = [executor.submit(process_resume, file_path, job_description_text, skills, processed_files)
+        futures = [executor.submit(process_resume, file_path, job_description_text, skills, processed_files,
+                                   results, checkpoint_key)
                    for file_path in file_paths]
         
         for future in as_completed(futures):
             result = future.result()
             if result:
-                all_extracted_data.append(result)
+                # Save progress after each resume
+                results.append(result)
 
-    # Save progress
-    df_progress = pd.DataFrame(all_extracted_data)
-    df_combined = pd.concat([df_existing, df_progress], ignore_index=True)
-    df_combined.to_excel(final_excel_path, index=False)
+    # Write the workbook once from the journal
+    results.export_excel(final_excel_path, df_existing)
 
     # Record the end time and calculate elapsed time
     end_time = time.time()
@@ -5,21 +5,17 @@ import pandas as pd
 import time
 import docx2txt
 from pathlib import Path
-from ollama import Client
-from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
-import nltk
+from llm_cache import LazyClient
+# NLTK + scikit-learn stopwords, vendored so startup needs no nltk.download()
+from english_stopwords import ENGLISH_STOP_WORDS
 
-# Download the required NLTK resources
-nltk.download('stopwords')
-from nltk.corpus import stopwords
-
-# Initialize the LLM client
-client = Client()
+# Initialize the LLM client (ollama is imported on the first request)
+client = LazyClient()
 
 # Function to clean the extracted text by removing non-printable characters and stopwords
 def clean_text(text):
     text = ''.join(char for char in text if char.isprintable())
-    stop_words = set(stopwords.words('english')).union(set(ENGLISH_STOP_WORDS))
+    stop_words = ENGLISH_STOP_WORDS
     cleaned_text = ' '.join(word for word in text.split() if word.lower() not in stop_words)
     return cleaned_text
 
@@ -1,29 +1,23 @@
 import pdfplumber
 import re
-from sklearn.metrics.pairwise import cosine_similarity
 import os
 import pandas as pd
 import time
-from sklearn.feature_extraction.text import TfidfVectorizer
 import docx2txt
 from pathlib import Path
-from ollama import Client
-from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
-import nltk
+from llm_cache import LazyClient
+# NLTK + scikit-learn stopwords, vendored so startup needs no nltk.download()
+from english_stopwords import ENGLISH_STOP_WORDS
 
-# Download the required NLTK resources
-nltk.download('stopwords')
-from nltk.corpus import stopwords
-
-# Initialize the LLM client
-client = Client()
+# Initialize the LLM client (ollama is imported on the first request)
+client = LazyClient()
 
 # Function to clean the extracted text by removing non-printable characters and stopwords
 def clean_text(text):
     # Remove non-printable characters
     text = ''.join(char for char in text if char.isprintable())
     # Remove stopwords
-    stop_words = set(stopwords.words('english')).union(set(ENGLISH_STOP_WORDS))
+    stop_words = ENGLISH_STOP_WORDS
     cleaned_text = ' '.join(word for word in text.split() if word.lower() not in stop_words)
     return cleaned_text
 
@@ -244,6 +238,10 @@ def calculate_score(resume_text, job_description):
 
 # Function to retrieve relevant documents from the knowledge base using RAG
 def retrieve_relevant_documents(query_text, documents):
+    # scikit-learn is only needed here, so it is not imported at startup
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
     vectorizer = TfidfVectorizer(stop_words='english')
     document_vectors = vectorizer.fit_transform(documents)
     query_vector = vectorizer.transform([query_text])
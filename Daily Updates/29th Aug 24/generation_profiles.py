@@ -0,0 +1,114 @@
+import re
+
+# Per-extractor generation limits. num_predict caps decode length, stop ends generation on a
+# sequence, and early_stop is a regex: the answer is streamed and the request is closed as soon as
+# the accumulated text matches, i.e. once the parsable part of the answer has arrived.
+GENERATION_PROFILES = {
+    "extract_information_llm": {"options": {"num_predict": 80}, "early_stop": r"Location:[^\n]*\S[^\n]*\n"},
+    "extract_phone_number": {"options": {"num_predict": 40}, "early_stop": r"Phone Number:[^\n]*\S[^\n]*\n"},
+    "total_experience": {"options": {"num_predict": 80}, "early_stop": r"Experience:[^\n]*\S[^\n]*\n"},
+    "fitment_summary": {"options": {"num_predict": 120}, "early_stop": r"Summary:[^\n]*\S[^\n]*\n"},
+    # Leading digits followed by a non-digit, so a streamed "8" is not mistaken for a finished "85"
+    "calculate_score": {"options": {"num_predict": 8, "stop": ["\n\n"]}, "early_stop": r"^\s*\d{1,3}(?=\D)"},
+    "evaluate_candidate": {"options": {"num_predict": 180}},
+    # JSON answers need the whole object, so they are only length-capped
+    "extract_profile_structured": {"options": {"num_predict": 150, "temperature": 0}},
+    "evaluate_skill_chunk": {"options": {}},
+}
+
+
+# Function to build the generate() keyword arguments for an extractor, merged with call-specific options
+def generation_kwargs(name, options=None):
+    profile = GENERATION_PROFILES.get(name, {})
+    merged = dict(profile.get("options", {}))
+    merged.update(options or {})
+    kwargs = {"options": merged}
+    if profile.get("early_stop"):
+        kwargs["early_stop"] = profile["early_stop"]
+    return kwargs
+
+
+def _chunk_get(chunk, field, default=None):
+    if isinstance(chunk, dict):
+        return chunk.get(field, default)
+    return getattr(chunk, field, default)
+
+
+# Prefill statistics; a server may report them before the final chunk, which an early-stopped stream never reads
+PREFILL_FIELDS = ("prompt_eval_count", "prompt_eval_duration", "load_duration")
+
+
+# Function to remember the prefill statistics of the first chunk that carries them
+def _keep_prefill(prefill, chunk):
+    for field in PREFILL_FIELDS:
+        value = _chunk_get(chunk, field)
+        if value is not None and field not in prefill:
+            prefill[field] = value
+
+
+# Function to assemble the final response dict from the streamed chunks seen so far
+def _assemble(pieces, last_chunk, early_stopped, prefill=None):
+    response = {"response": "".join(pieces), "early_stopped": early_stopped}
+    response.update(prefill or {})
+    if last_chunk is not None:
+        for field in ("model", "context", "total_duration", "load_duration", "prompt_eval_count",
+                      "prompt_eval_duration", "eval_count", "eval_duration", "done_reason"):
+            value = _chunk_get(last_chunk, field)
+            if value is not None:
+                response[field] = value
+    if early_stopped:
+        # The server never sends its final statistics for an aborted stream; count decoded chunks instead
+        response.setdefault("eval_count", len(pieces))
+    return response
+
+
+# Function to read a streaming generate() response, stopping once early_stop matches
+def consume_stream(chunks, early_stop):
+    pattern = re.compile(early_stop)
+    pieces = []
+    prefill = {}
+    last_chunk = None
+    try:
+        for chunk in chunks:
+            pieces.append(_chunk_get(chunk, "response", "") or "")
+            last_chunk = chunk
+            _keep_prefill(prefill, chunk)
+            if _chunk_get(chunk, "done"):
+                return _assemble(pieces, chunk, False)
+            if pattern.search("".join(pieces)):
+                return _assemble(pieces, None, True, prefill)
+    finally:
+        # Closing the generator closes the HTTP response, which makes Ollama stop decoding
+        if hasattr(chunks, "close"):
+            chunks.close()
+    return _assemble(pieces, last_chunk, False)
+
+
+# Async counterpart of consume_stream for ollama.AsyncClient streams
+async def consume_stream_async(chunks, early_stop):
+    pattern = re.compile(early_stop)
+    pieces = []
+    prefill = {}
+    last_chunk = None
+    try:
+        async for chunk in chunks:
+            pieces.append(_chunk_get(chunk, "response", "") or "")
+            last_chunk = chunk
+            _keep_prefill(prefill, chunk)
+            if _chunk_get(chunk, "done"):
+                return _assemble(pieces, chunk, False)
+            if pattern.search("".join(pieces)):
+                return _assemble(pieces, None, True, prefill)
+    finally:
+        if hasattr(chunks, "aclose"):
+            await chunks.aclose()
+    return _assemble(pieces, last_chunk, False)
+
+
+# Function to call generate() on any client, streaming with early termination when early_stop is given
+def generate_with_early_stop(client, early_stop=None, **kwargs):
+    if not early_stop:
+        return client.generate(**kwargs)
+    if hasattr(client, "generate_until"):
+        return client.generate_until(early_stop, **kwargs)
+    return consume_stream(client.generate(stream=True, **kwargs), early_stop)
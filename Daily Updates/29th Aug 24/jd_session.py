@@ -0,0 +1,65 @@
+# Job-description-primed prompting: every per-resume prompt starts with the same JD prefix so the
+# model only prefills the role description once per batch. Two mechanisms are used together:
+#   1. the prefix is sent once and the returned `context` (token ids) is passed to later calls, and
+#   2. the prompt text itself starts with the identical prefix, so the server's prompt cache can
+#      reuse the KV entries even when the context is not reused (e.g. after a model reload).
+
+import threading
+
+# Keep the model (and its KV cache) resident between resumes
+DEFAULT_KEEP_ALIVE = "30m"
+
+
+# Function to build the shared, byte-identical prefix for a job description
+def job_description_prefix(job_description):
+    return (
+        "You are screening candidates for the following role.\n\n"
+        f"Job Description:\n{job_description}\n\n"
+        "Each following request contains one candidate resume and a task about it.\n"
+    )
+
+
+class JobDescriptionSession:
+    includes_job_description = True
+    includes_resume = False
+
+    def __init__(self, client, job_description, model="llama3:latest", keep_alive=DEFAULT_KEEP_ALIVE, num_ctx=8192):
+        self.client = client
+        self.model = model
+        self.keep_alive = keep_alive
+        self.num_ctx = num_ctx
+        self.prefix = job_description_prefix(job_description)
+        self.context = None
+        self.prime_stats = {}
+        self._lock = threading.Lock()
+
+    # Function to prefill the JD once and keep the returned context for the rest of the batch
+    def prime(self):
+        response = self.client.generate(model=self.model, prompt=self.prefix, keep_alive=self.keep_alive,
+                                        options={"num_predict": 1, "num_ctx": self.num_ctx, "temperature": 0})
+        self.context = response.get('context') or []
+        self.prime_stats = {
+            "prompt_eval_count": response.get('prompt_eval_count'),
+            "prompt_eval_duration": response.get('prompt_eval_duration'),
+        }
+        return self.context
+
+    # Function to prime exactly once, even when several worker threads start at the same time
+    def ensure_primed(self):
+        if self.context is None:
+            with self._lock:
+                if self.context is None:
+                    self.prime()
+        return self.context
+
+    # Function to run a per-resume task on top of the primed JD prefix
+    def generate(self, prompt, options=None, **kwargs):
+        self.ensure_primed()
+        merged_options = {"num_ctx": self.num_ctx}
+        merged_options.update(options or {})
+        if self.context:
+            return self.client.generate(model=self.model, prompt=prompt, context=self.context,
+                                        keep_alive=self.keep_alive, options=merged_options, **kwargs)
+        # No context returned (e.g. an older server): fall back to plain prefix caching
+        return self.client.generate(model=self.model, prompt=self.prefix + prompt,
+                                    keep_alive=self.keep_alive, options=merged_options, **kwargs)
@@ -0,0 +1,133 @@
+import re
+
+# Profile sites the pipeline reports, by category. Portfolio hosts serve one site per subdomain (jane.github.io)
+# or per path (about.me/jane).
+PROFILE_SITES = {
+    "github": ("github.com",),
+    "linkedin": ("linkedin.com",),
+    "gitlab": ("gitlab.com",),
+    "kaggle": ("kaggle.com",),
+    "portfolio": ("github.io", "gitlab.io", "netlify.app", "vercel.app", "pages.dev", "herokuapp.com", "wixsite.com",
+                  "wordpress.com", "notion.site", "carrd.co", "about.me", "behance.net", "dribbble.com"),
+}
+PROFILE_CATEGORIES = list(PROFILE_SITES)
+SITE_CATEGORY = {domain: category for category, domains in PROFILE_SITES.items() for domain in domains}
+DOMAINS = list(SITE_CATEGORY)
+
+# Path segments a link needs before it points at a profile: linkedin.com/in/<name>, github.com/<user>.
+# A bare domain or linkedin.com/in is a mention of the site, not a link to anyone.
+MIN_PATH_SEGMENTS = {"github": 1, "linkedin": 2, "gitlab": 1, "kaggle": 1, "portfolio": 0}
+# Usernames and slugs on these sites are case-insensitive; portfolio paths may not be
+CASE_INSENSITIVE_CATEGORIES = {"github", "linkedin", "gitlab", "kaggle"}
+
+# Characters a URL can contain in resume text; punctuation that usually ends a sentence is trimmed afterwards
+URL_CHARS = r'[^\s<>"\'`,;()\[\]{}|\\^]'
+PATH_RE = re.compile('/' + URL_CHARS + '*')
+# Characters of a host name, scanned leftwards from a domain hit to pick up subdomains (jane.github.io)
+HOST_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789.-')
+# The start of the next line when a PDF wrapped a long URL: one token of URL characters
+CONTINUATION_RE = re.compile(r'[ \t]*\r?\n[ \t]*(' + URL_CHARS + r'+)')
+# A URL cut right after one of these characters cannot be complete
+BROKEN_URL_ENDINGS = ('-', '_', '=', '?', '&', '%', '#')
+TRAILING_PUNCTUATION = '.,:;!?\'"'
+QUERY_RE = re.compile(r'[?#]')
+# Country and mobile LinkedIn hosts (in.linkedin.com, m.linkedin.com) are the same profile
+LINKEDIN_SUBDOMAIN_RE = re.compile(r'^(?:[a-z]{2}|m|mobile)\.linkedin\.com$')
+
+
+# Function to tell which profile site a host belongs to, and the site's domain (every domain above is two labels)
+def site_of(host):
+    domain = '.'.join(host.rsplit('.', 2)[-2:])
+    return SITE_CATEGORY.get(domain), domain
+
+
+# Function to normalize one matched link to https://host/path without www, query, fragment or trailing slash
+# (lower-cased where the site ignores case); returns (category, url), or None when it is not a profile link
+def normalize_link(host, path):
+    host = host.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    host = LINKEDIN_SUBDOMAIN_RE.sub('linkedin.com', host)
+    category, domain = site_of(host)
+    if category is None:
+        return None
+    path = QUERY_RE.split(path, maxsplit=1)[0].rstrip(TRAILING_PUNCTUATION)
+    segments = [segment for segment in path.split('/') if segment]
+    if len(segments) < MIN_PATH_SEGMENTS[category]:
+        return None
+    # A portfolio needs its own subdomain (jane.netlify.app) or a path (about.me/jane)
+    if category == "portfolio" and host == domain and not segments:
+        return None
+    path = '/' + '/'.join(segments) if segments else ''
+    if category in CASE_INSENSITIVE_CATEGORIES:
+        path = path.lower()
+    return category, f"https://{host}{path}"
+
+
+# Function to tell whether a link cut at a line break continues on the next line: it ends in a character no URL
+# ends with, or it ends in "/" before reaching a profile (linkedin.com/in/ + "jane-doe")
+def is_broken(host, path):
+    if path.endswith(BROKEN_URL_ENDINGS):
+        return True
+    if not path.endswith('/'):
+        return False
+    category, _ = site_of(host.lower())
+    return category is not None and len([segment for segment in path.split('/') if segment]) < MIN_PATH_SEGMENTS[category]
+
+
+# Function to find every profile domain in a text: [(start, end)] in order. This is the keyword pass of an
+# Aho-Corasick/FlashText matcher, done as one str.find loop per domain on the lower-cased text, which runs at C
+# speed and needs nothing built per call. Hits glued to a longer word (github.community) are dropped.
+def find_domains(lowered):
+    hits = []
+    for domain in DOMAINS:
+        start = lowered.find(domain)
+        while start != -1:
+            end = start + len(domain)
+            if end == len(lowered) or not (lowered[end].isalnum() or lowered[end] in '_-'):
+                hits.append((start, end))
+            start = lowered.find(domain, end)
+    hits.sort()
+    return hits
+
+
+# Function to yield (category, url) for every profile link in a text, in order: each domain hit is widened to the
+# full URL (subdomains to the left, the path to the right) and URLs wrapped over lines are rejoined
+def iter_links(text):
+    text = text or ''
+    lowered = text.lower()
+    consumed = 0
+    for start, end in find_domains(lowered):
+        # A domain inside a link already taken (linkedin.com/in/jane?ref=github.com) is part of that link
+        if start < consumed:
+            continue
+        while start > 0 and lowered[start - 1] in HOST_CHARS:
+            start -= 1
+        # jane@github.com is an e-mail address, not a link
+        if start > 0 and (lowered[start - 1] == '@' or lowered[start - 1].isalnum() or lowered[start - 1] == '_'):
+            continue
+        host = lowered[start:end].lstrip('.-')
+        match = PATH_RE.match(text, end)
+        path = match.group(0) if match else ''
+        end = match.end() if match else end
+        while is_broken(host, path):
+            continuation = CONTINUATION_RE.match(text, end)
+            if not continuation:
+                break
+            path += continuation.group(1)
+            end = continuation.end()
+        consumed = end
+        link = normalize_link(host, path)
+        if link:
+            yield link
+
+
+# Function to collect the profile links of a resume: link annotations first (exact targets), then the text.
+# Returns {category: [url, ...]} for every category; duplicates that only differ in form are collapsed.
+def extract_links(text, uris=()):
+    links = {category: [] for category in PROFILE_CATEGORIES}
+    for source in list(uris) + [text]:
+        for category, url in iter_links(source):
+            if url not in links[category]:
+                links[category].append(url)
+    return links
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from generation_profiles import generate_with_early_stop
+
+# Default location of the on-disk LLM response cache
+DEFAULT_CACHE_PATH = 'llm_cache.sqlite'
+
+# Request arguments that change the model output and therefore belong in the cache key
+KEY_FIELDS = ('model', 'prompt', 'system', 'template', 'format', 'options', 'context', 'raw', 'images', 'messages',
+              'early_stop')
+
+
+# Function to build a stable, content-addressed cache key for a generate/chat request
+def make_cache_key(kind, request):
+    prompt_hash = hashlib.sha256(json.dumps(request.get('prompt'), ensure_ascii=False).encode('utf-8')).hexdigest()
+    key_data = {field: request.get(field) for field in KEY_FIELDS if field != 'prompt' and request.get(field) is not None}
+    key_data['kind'] = kind
+    key_data['prompt_sha256'] = prompt_hash
+    serialized = json.dumps(key_data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+# Function to turn an Ollama response (dict or pydantic model) into a plain JSON-serializable dict
+def response_to_dict(response):
+    if isinstance(response, dict):
+        return dict(response)
+    if hasattr(response, 'model_dump'):
+        return response.model_dump(mode='json')
+    return dict(response)
+
+
+# SQLite-backed response store; WAL mode makes it safe to share between threads and processes
+class LLMCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=None, max_bytes=None, max_age_seconds=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        conn.commit()
+
+    # One connection per thread (and per process, since the thread-local is not inherited usefully by forks)
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, name):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    # Function to look up a cached response; returns None on a miss or an expired entry
+    def get(self, key):
+        conn = self._connection()
+        row = conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count('misses')
+            return None
+        response, created_at = row
+        now = time.time()
+        if self.max_age_seconds is not None and now - created_at > self.max_age_seconds:
+            with conn:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._count('evictions')
+            self._count('misses')
+            return None
+        with conn:
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        self._count('hits')
+        return json.loads(response)
+
+    # Function to store a response and apply the size/age limits
+    def put(self, key, model, response):
+        payload = json.dumps(response, ensure_ascii=False)
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, payload, len(payload.encode('utf-8')), now, now),
+            )
+        self._count('writes')
+        self.evict()
+
+    # Function to drop expired entries, then least-recently-used ones until the size limits hold
+    def evict(self):
+        conn = self._connection()
+        removed = 0
+        with conn:
+            if self.max_age_seconds is not None:
+                removed += conn.execute("DELETE FROM responses WHERE created_at < ?",
+                                        (time.time() - self.max_age_seconds,)).rowcount
+            if self.max_entries is not None:
+                removed += conn.execute("""
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )""", (self.max_entries,)).rowcount
+            if self.max_bytes is not None:
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+                if total > self.max_bytes:
+                    for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC").fetchall():
+                        if total <= self.max_bytes:
+                            break
+                        conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        total -= size
+                        removed += 1
+        if removed:
+            with self._stats_lock:
+                self.evictions += removed
+        return removed
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM responses")
+
+    # Function to report hit/miss counters together with the current on-disk footprint
+    def stats(self):
+        conn = self._connection()
+        entries, total_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total_bytes,
+        }
+
+
+# Stand-in for ollama.Client that imports ollama and creates the real client on first use, so a run answered
+# entirely from the cache, or a job that never calls the LLM, does not pay for importing ollama and httpx
+class LazyClient:
+    def __init__(self, **client_kwargs):
+        self._client_kwargs = client_kwargs
+        self._client = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # Private names (looked up by copy/pickle before __init__ has run) never reach the real client
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from ollama import Client
+                    self._client = Client(**self._client_kwargs)
+        return getattr(self._client, name)
+
+
+# Drop-in wrapper around ollama.Client that serves repeated requests from the cache
+class CachedClient:
+    def __init__(self, client, cache):
+        self.client = client
+        self.cache = cache
+
+    def generate(self, **kwargs):
+        # Streaming responses are consumed incrementally by the caller, so they bypass the cache
+        if kwargs.get('stream'):
+            return self.client.generate(**kwargs)
+        key = make_cache_key('generate', kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            cached['cache_hit'] = True
+            return cached
+        early_stop = kwargs.pop('early_stop', None)
+        response = response_to_dict(generate_with_early_stop(self.client, early_stop, **kwargs))
+        self.cache.put(key, kwargs.get('model'), response)
+        response['cache_hit'] = False
+        return response
+
+    def chat(self, **kwargs):
+        if kwargs.get('stream'):
+            return self.client.chat(**kwargs)
+        key = make_cache_key('chat', kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            cached['cache_hit'] = True
+            return cached
+        response = response_to_dict(self.client.chat(**kwargs))
+        self.cache.put(key, kwargs.get('model'), response)
+        response['cache_hit'] = False
+        return response
+
+    # Anything else (pull, list, embeddings, ...) goes straight to the real client
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def stats(self):
+        return self.cache.stats()
+
+    def print_stats(self):
+        stats = self.cache.stats()
+        print(f"LLM cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"(hit rate {stats['hit_rate']:.0%}), {stats['entries']} entries, {stats['bytes'] / 1024:.1f} KiB")
@@ -0,0 +1,72 @@
+import json
+import re
+
+# Map JSON-schema type names to the Python types json.loads produces
+JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+    "null": type(None),
+}
+
+
+# Function to check a decoded JSON value against the subset of JSON schema we send to Ollama
+# Returns a list of error strings; an empty list means the value is valid
+def validate_json(value, schema, path="$"):
+    errors = []
+    expected = schema.get("type")
+    if expected is not None:
+        types = expected if isinstance(expected, list) else [expected]
+        python_types = tuple(t for name in types for t in (JSON_TYPES[name] if isinstance(JSON_TYPES[name], tuple) else (JSON_TYPES[name],)))
+        # bool is a subclass of int, so reject it explicitly for numeric types
+        if isinstance(value, bool) and "boolean" not in types:
+            return [f"{path}: expected {expected}, got boolean"]
+        if not isinstance(value, python_types):
+            return [f"{path}: expected {expected}, got {type(value).__name__}"]
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: {value!r} not in {schema['enum']}")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if "minimum" in schema and value < schema["minimum"]:
+            errors.append(f"{path}: {value} < minimum {schema['minimum']}")
+        if "maximum" in schema and value > schema["maximum"]:
+            errors.append(f"{path}: {value} > maximum {schema['maximum']}")
+    if isinstance(value, dict):
+        for field in schema.get("required", []):
+            if field not in value:
+                errors.append(f"{path}.{field}: missing required field")
+        for field, field_schema in schema.get("properties", {}).items():
+            if field in value:
+                errors.extend(validate_json(value[field], field_schema, f"{path}.{field}"))
+    if isinstance(value, list) and "items" in schema:
+        for index, item in enumerate(value):
+            errors.extend(validate_json(item, schema["items"], f"{path}[{index}]"))
+    return errors
+
+
+# Function to decode a model answer as JSON, tolerating code fences or chatter around the object
+def parse_json_response(text):
+    if not isinstance(text, str):
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    match = re.search(r'\{.*\}', text, re.DOTALL)
+    if match:
+        try:
+            return json.loads(match.group(0))
+        except ValueError:
+            return None
+    return None
+
+
+# Function to decode and validate in one step; returns (data, errors)
+def parse_and_validate(text, schema):
+    data = parse_json_response(text)
+    if data is None:
+        return None, ["response is not valid JSON"]
+    errors = validate_json(data, schema)
+    return (data if not errors else None), errors
@@ -0,0 +1,214 @@
+import contextvars
+import functools
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# Default location of the per-call metrics database (query it with sqlite3 or pandas.read_sql)
+DEFAULT_METRICS_PATH = 'llm_metrics.sqlite'
+
+# Which extractor and resume the current LLM call belongs to; set by extractor_scope / resume_scope
+current_extractor = contextvars.ContextVar('current_extractor', default=None)
+current_resume = contextvars.ContextVar('current_resume', default=None)
+# Calls made inside the innermost extractor scope, waiting for that extractor's parse result
+pending_calls = contextvars.ContextVar('pending_calls', default=None)
+
+# Ollama reports durations in nanoseconds
+NS_PER_S = 1e9
+
+
+class resume_scope:
+    def __init__(self, resume_id):
+        self.resume_id = resume_id
+
+    def __enter__(self):
+        self.token = current_resume.set(self.resume_id)
+        return self
+
+    def __exit__(self, *exc):
+        current_resume.reset(self.token)
+
+
+# Context manager attributing every LLM call inside it to one extractor
+# parse_success is written for all of those calls when the scope closes
+class extractor_scope:
+    def __init__(self, name):
+        self.name = name
+        self.parse_success = None
+
+    def __enter__(self):
+        self.tokens = (current_extractor.set(self.name), pending_calls.set([]))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        calls = pending_calls.get()
+        current_extractor.reset(self.tokens[0])
+        pending_calls.reset(self.tokens[1])
+        parse_success = False if exc_type is not None else self.parse_success
+        for record, metrics in calls:
+            record["parse_success"] = parse_success
+            metrics.write(record)
+
+
+# Decorator for extractors: attributes their LLM calls and judges parse success from the return value
+def instrumented(name, parse_ok=lambda result: result is not None):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with extractor_scope(name) as scope:
+                result = func(*args, **kwargs)
+                scope.parse_success = bool(parse_ok(result))
+            return result
+        return wrapper
+    return decorator
+
+
+# SQLite store of one row per LLM call
+class LLMMetrics:
+    COLUMNS = ("run_id", "timestamp", "extractor", "resume_id", "model", "cache_hit", "early_stopped",
+               "parse_success", "wall_ms", "prompt_eval_count", "eval_count", "prompt_eval_duration",
+               "eval_duration", "load_duration", "total_duration")
+
+    def __init__(self, path=DEFAULT_METRICS_PATH, run_id=None):
+        self.path = path
+        self.run_id = run_id or time.strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_calls (
+                run_id TEXT, timestamp REAL, extractor TEXT, resume_id TEXT, model TEXT,
+                cache_hit INTEGER, early_stopped INTEGER, parse_success INTEGER, wall_ms REAL,
+                prompt_eval_count INTEGER, eval_count INTEGER, prompt_eval_duration INTEGER,
+                eval_duration INTEGER, load_duration INTEGER, total_duration INTEGER
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_calls_run ON llm_calls (run_id, extractor)")
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # Function to store a call record; calls made inside an extractor scope wait for its parse result
+    def record(self, record):
+        calls = pending_calls.get()
+        if calls is not None:
+            calls.append((record, self))
+        else:
+            self.write(record)
+
+    def write(self, record):
+        conn = self._connection()
+        with conn:
+            conn.execute(f"INSERT INTO llm_calls ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                         tuple(record.get(column) for column in self.COLUMNS))
+
+    def rows(self, run_id=None):
+        conn = self._connection()
+        cursor = conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM llm_calls WHERE run_id = ?",
+                              (run_id or self.run_id,))
+        return [dict(zip(self.COLUMNS, row)) for row in cursor.fetchall()]
+
+    # Function to summarize a run per extractor: call count, p50/p95 latency, throughput and failure rate
+    def report(self, run_id=None):
+        by_extractor = {}
+        for row in self.rows(run_id):
+            by_extractor.setdefault(row["extractor"] or "unattributed", []).append(row)
+        summary = []
+        for extractor, rows in sorted(by_extractor.items()):
+            latencies = sorted(row["wall_ms"] for row in rows)
+            model_rows = [row for row in rows if not row["cache_hit"]]
+            eval_tokens = sum(row["eval_count"] or 0 for row in model_rows if row["eval_duration"])
+            eval_seconds = sum(row["eval_duration"] or 0 for row in model_rows) / NS_PER_S
+            # Early-stopped streams usually end before the server reports prefill statistics; only calls that
+            # carry them count towards prefill throughput, and the number of such calls is reported with it
+            prefill_rows = [row for row in model_rows if row["prompt_eval_duration"]]
+            prompt_tokens = sum(row["prompt_eval_count"] or 0 for row in prefill_rows)
+            prompt_seconds = sum(row["prompt_eval_duration"] for row in prefill_rows) / NS_PER_S
+            judged = [row for row in rows if row["parse_success"] is not None]
+            summary.append({
+                "Extractor": extractor,
+                "Calls": len(rows),
+                "Cache Hits": sum(1 for row in rows if row["cache_hit"]),
+                "p50 Latency (ms)": round(percentile(latencies, 50), 1),
+                "p95 Latency (ms)": round(percentile(latencies, 95), 1),
+                "Prompt Tokens": sum(row["prompt_eval_count"] or 0 for row in rows),
+                "Output Tokens": sum(row["eval_count"] or 0 for row in rows),
+                "Prefill Tokens/s": round(prompt_tokens / prompt_seconds, 1) if prompt_seconds else None,
+                "Prefill Measured Calls": len(prefill_rows),
+                "Early-Stopped Calls": sum(1 for row in model_rows if row["early_stopped"]),
+                "Decode Tokens/s": round(eval_tokens / eval_seconds, 1) if eval_seconds else None,
+                "Parse Failure Rate": (round(sum(1 for row in judged if not row["parse_success"]) / len(judged), 3)
+                                       if judged else None),
+            })
+        return summary
+
+    def print_report(self, run_id=None):
+        print(f"LLM telemetry for run {run_id or self.run_id} ({self.path}):")
+        for item in self.report(run_id):
+            print(f"  {item['Extractor']}: {item['Calls']} calls ({item['Cache Hits']} cached), "
+                  f"p50 {item['p50 Latency (ms)']} ms, p95 {item['p95 Latency (ms)']} ms, "
+                  f"prefill {item['Prefill Tokens/s']} tok/s ({item['Prefill Measured Calls']} calls measured, "
+                  f"{item['Early-Stopped Calls']} early-stopped), "
+                  f"decode {item['Decode Tokens/s']} tok/s, parse failures {item['Parse Failure Rate']}")
+
+
+# Function to compute a percentile by linear interpolation over sorted values
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+# Client wrapper that records one metrics row per generate/chat call
+class TelemetryClient:
+    def __init__(self, client, metrics):
+        self.client = client
+        self.metrics = metrics
+
+    def _timed(self, method, kwargs):
+        start = time.perf_counter()
+        response = getattr(self.client, method)(**kwargs)
+        wall_ms = (time.perf_counter() - start) * 1000
+        if not kwargs.get('stream'):
+            get = response.get if hasattr(response, 'get') else lambda field: getattr(response, field, None)
+            cache_hit = bool(get('cache_hit'))
+            # A cached response carries the timings of the original call, which would skew the model statistics
+            if cache_hit:
+                get = lambda field: None
+            self.metrics.record({
+                "run_id": self.metrics.run_id,
+                "timestamp": time.time(),
+                "extractor": current_extractor.get(),
+                "resume_id": current_resume.get(),
+                "model": kwargs.get('model'),
+                "cache_hit": int(cache_hit),
+                "early_stopped": int(bool(get('early_stopped'))),
+                "wall_ms": wall_ms,
+                "prompt_eval_count": get('prompt_eval_count'),
+                "eval_count": get('eval_count'),
+                "prompt_eval_duration": get('prompt_eval_duration'),
+                "eval_duration": get('eval_duration'),
+                "load_duration": get('load_duration'),
+                "total_duration": get('total_duration'),
+            })
+        return response
+
+    def generate(self, **kwargs):
+        return self._timed('generate', kwargs)
+
+    def chat(self, **kwargs):
+        return self._timed('chat', kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
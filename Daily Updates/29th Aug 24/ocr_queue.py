@@ -0,0 +1,139 @@
+import argparse
+import importlib.util
+import io
+import os
+import sqlite3
+import threading
+import time
+
+from parsed_document import ParsedDocument, URL_RE, MIN_TEXT_CHARS
+
+# Default location of the quarantine queue for documents without a text layer
+DEFAULT_OCR_QUEUE_PATH = 'ocr_queue.sqlite'
+
+# Resolution pages are rendered at for OCR; 300 dpi is what Tesseract is tuned for
+OCR_DPI = 300
+
+
+# Local OCR is optional: without PyMuPDF (to rasterize pages) and pytesseract the queue just accumulates.
+# They are only imported when the OCR stage actually runs.
+def ocr_available():
+    return all(importlib.util.find_spec(name) is not None for name in ("fitz", "pytesseract", "PIL"))
+
+
+# Documents the pipeline refused to send to the LLM because they had no usable text.
+# Files on disk are referenced by path; in-memory sources (archive members) keep their bytes here.
+class OCRQueue:
+    def __init__(self, path=DEFAULT_OCR_QUEUE_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS ocr_queue (
+                content_hash TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                path TEXT,
+                data BLOB,
+                reason TEXT NOT NULL,
+                extractor_version TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                queued_at REAL NOT NULL,
+                processed_at REAL
+            )
+        """)
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # Function to quarantine a document; a document already queued (same content) is not added twice
+    def add(self, content_hash, filename, path, reason, extractor_version, data=None):
+        conn = self._connection()
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO ocr_queue (content_hash, filename, path, data, reason, extractor_version, "
+                         "queued_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (content_hash, filename, None if data is not None else os.path.abspath(path), data, reason,
+                          extractor_version, time.time()))
+
+    def pending(self):
+        cursor = self._connection().execute(
+            "SELECT content_hash, filename, path, data, reason, extractor_version FROM ocr_queue WHERE status = 'queued' "
+            "ORDER BY queued_at")
+        columns = ("content_hash", "filename", "path", "data", "reason", "extractor_version")
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def mark(self, content_hash, status):
+        conn = self._connection()
+        with conn:
+            conn.execute("UPDATE ocr_queue SET status = ?, processed_at = ? WHERE content_hash = ?",
+                         (status, time.time(), content_hash))
+
+    def counts(self):
+        return dict(self._connection().execute("SELECT status, COUNT(*) FROM ocr_queue GROUP BY status").fetchall())
+
+    def print_stats(self):
+        counts = self.counts()
+        if counts:
+            print(f"OCR queue ({self.path}): " + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+
+
+# Function to OCR every page of a PDF (from disk or bytes) into a ParsedDocument
+def ocr_pdf(name, path=None, data=None):
+    import fitz
+    import pytesseract
+    from PIL import Image
+
+    pages = []
+    with (fitz.open(stream=data, filetype="pdf") if data is not None else fitz.open(path)) as pdf:
+        for page in pdf:
+            pixmap = page.get_pixmap(dpi=OCR_DPI)
+            image = Image.open(io.BytesIO(pixmap.tobytes("png")))
+            pages.append(pytesseract.image_to_string(image) or "")
+    text = "\n".join(pages)
+    document = ParsedDocument(name, pages, [], URL_RE.findall(text))
+    document.backend = "ocr"
+    return document
+
+
+# Function to drain the queue: OCR each queued PDF and store its text in the extraction cache under the document's
+# content hash, so the next pipeline run picks it up like any other text PDF. Returns the sources that now have text.
+def run_ocr_queue(queue, extraction_cache):
+    if not ocr_available():
+        print("OCR stage skipped: install PyMuPDF, pytesseract and Pillow (plus the Tesseract binary) to enable it")
+        return []
+    ready = []
+    for entry in queue.pending():
+        if not entry["filename"].lower().endswith('.pdf'):
+            queue.mark(entry["content_hash"], "unsupported")
+            continue
+        try:
+            document = ocr_pdf(entry["filename"], entry["path"], entry["data"])
+        except Exception as exc:
+            print(f"OCR failed: {entry['filename']} ({type(exc).__name__}: {exc})")
+            queue.mark(entry["content_hash"], "failed")
+            continue
+        if sum(1 for char in document.text if not char.isspace()) < MIN_TEXT_CHARS:
+            queue.mark(entry["content_hash"], "empty")
+            continue
+        extraction_cache.put(entry["content_hash"], entry["extractor_version"], document)
+        queue.mark(entry["content_hash"], "done")
+        ready.append(entry)
+        print(f"OCR done: {entry['filename']} ({len(document.pages)} pages)")
+    return ready
+
+if __name__ == "__main__":
+    from extraction_cache import ExtractionCache, DEFAULT_EXTRACTION_CACHE_PATH
+
+    parser = argparse.ArgumentParser(description="OCR the documents quarantined for having no text layer")
+    parser.add_argument("--queue", default=DEFAULT_OCR_QUEUE_PATH)
+    parser.add_argument("--cache", default=DEFAULT_EXTRACTION_CACHE_PATH)
+    args = parser.parse_args()
+    ocr_queue = OCRQueue(args.queue)
+    run_ocr_queue(ocr_queue, ExtractionCache(args.cache))
+    ocr_queue.print_stats()
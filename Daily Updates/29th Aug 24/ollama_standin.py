@@ -0,0 +1,303 @@
+# Local stand-in for the Ollama HTTP API (/api/generate, /api/chat, /api/tags, /api/version) so the
+# pipelines can be benchmarked without a GPU or a model. Three modes:
+#   replay  - answer from a recording (JSONL) keyed by a hash of the request; misses are synthesized
+#   record  - proxy to a real Ollama server and append every answer to the recording
+#   synth   - make up schema-valid answers, paced by a configurable latency/throughput model
+# Point the pipeline at it with OLLAMA_HOST=http://127.0.0.1:<port>.
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 11435
+DEFAULT_RECORDING_PATH = 'ollama_recording.jsonl'
+
+# Request fields that identify an answer in the recording
+REPLAY_KEY_FIELDS = ('model', 'prompt', 'system', 'messages', 'format', 'options', 'context')
+
+
+# Latency model for synthesized answers: load time once per model, then prefill and decode rates
+class LatencyModel:
+    def __init__(self, load_seconds=0.0, prefill_tokens_per_s=400.0, decode_tokens_per_s=20.0, max_parallel=1):
+        self.load_seconds = load_seconds
+        self.prefill_tokens_per_s = prefill_tokens_per_s
+        self.decode_tokens_per_s = decode_tokens_per_s
+        # Like OLLAMA_NUM_PARALLEL: requests beyond this many queue up
+        self.slots = threading.Semaphore(max_parallel)
+        self.loaded_models = set()
+        self.lock = threading.Lock()
+
+    def load_time(self, model):
+        with self.lock:
+            if model in self.loaded_models:
+                return 0.0
+            self.loaded_models.add(model)
+        return self.load_seconds
+
+    def prefill_time(self, prompt_tokens):
+        return prompt_tokens / self.prefill_tokens_per_s if self.prefill_tokens_per_s else 0.0
+
+    def decode_time(self, output_tokens):
+        return output_tokens / self.decode_tokens_per_s if self.decode_tokens_per_s else 0.0
+
+
+# Function to roughly count tokens the way llama3 would (about 4 characters per token)
+def count_tokens(text):
+    return max(1, len(text or '') // 4)
+
+
+def replay_key(endpoint, request):
+    key_data = {field: request.get(field) for field in REPLAY_KEY_FIELDS if request.get(field) is not None}
+    key_data['endpoint'] = endpoint
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+
+
+# Function to produce a minimal value that validates against a JSON schema
+def value_for_schema(schema):
+    kind = schema.get('type')
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != 'null'), 'null')
+    if 'enum' in schema:
+        return schema['enum'][0]
+    if kind == 'object':
+        return {name: value_for_schema(sub) for name, sub in schema.get('properties', {}).items()}
+    if kind == 'array':
+        return [value_for_schema(schema.get('items', {}))]
+    if kind == 'integer':
+        return int(schema.get('minimum', 1))
+    if kind == 'number':
+        return float(schema.get('minimum', 2))
+    if kind == 'boolean':
+        return True
+    if kind == 'string':
+        return 'Synthetic value'
+    return None
+
+
+# Function to make up an answer in the format the prompt asks for, so every parser in the pipeline succeeds
+def synthesize_text(request):
+    prompt = request.get('prompt') or ''
+    if request.get('messages'):
+        prompt = request['messages'][-1].get('content', '')
+    fmt = request.get('format')
+    if isinstance(fmt, dict):
+        value = value_for_schema(fmt)
+        # Batched skill prompts list numbered skills; answer one entry per skill
+        if isinstance(value, dict) and isinstance(value.get('skills'), list):
+            count = sum(1 for line in prompt.splitlines() if line.strip()[:1].isdigit() and '. ' in line)
+            value['skills'] = [{"id": i, "has_skill": i % 2 == 0, "observation": "Synthetic observation of the skill."}
+                               for i in range(max(count, 1))]
+        return json.dumps(value)
+    if fmt == 'json':
+        return '{}'
+    if 'numerical score' in prompt:
+        return '72'
+    lines = []
+    for label, value in (('Name:', 'Jane Doe'), ('Location:', 'Pune, India'), ('Phone Number:', '+91 98765 43210'),
+                         ('Experience:', '2 years'), ('Summary:', 'The candidate has relevant Python and data skills.')):
+        if label in prompt:
+            lines.append(f"- {label} {value}")
+    return '\n'.join(lines) + '\n' if lines else 'The candidate has relevant experience with this skill.'
+
+
+class StandinState:
+    def __init__(self, mode, recording_path, latency, upstream=None, pace=True):
+        self.mode = mode
+        self.recording_path = recording_path
+        self.latency = latency
+        self.upstream = upstream
+        self.pace = pace
+        self.recording = {}
+        self.stats = {"requests": 0, "replayed": 0, "synthesized": 0, "recorded": 0}
+        self.lock = threading.Lock()
+        if recording_path and os.path.exists(recording_path):
+            with open(recording_path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.recording[entry['key']] = entry['response']
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def save(self, key, response):
+        with self.lock:
+            self.recording[key] = response
+            with open(self.recording_path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps({"key": key, "response": response}, ensure_ascii=False) + '\n')
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/api/version':
+            self.send_json({"version": "0.0.0-standin"})
+        elif self.path == '/api/tags':
+            self.send_json({"models": [{"name": "llama3:latest", "model": "llama3:latest"}]})
+        else:
+            self.send_json({"error": "not found"}, 404)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        request = json.loads(self.rfile.read(length) or b'{}')
+        endpoint = self.path.rsplit('/', 1)[-1]
+        if endpoint not in ('generate', 'chat'):
+            self.send_json({"error": f"unsupported endpoint {self.path}"}, 404)
+            return
+        state = self.server.state
+        state.count('requests')
+        key = replay_key(endpoint, request)
+
+        if state.mode == 'record':
+            response = self.forward(endpoint, request)
+            state.save(key, response)
+            state.count('recorded')
+            self.respond(request, response, paced=False)
+            return
+
+        if state.mode == 'replay' and key in state.recording:
+            state.count('replayed')
+            self.respond(request, dict(state.recording[key]), paced=False)
+            return
+
+        state.count('synthesized')
+        self.respond(request, self.synthesize(endpoint, request), paced=state.pace)
+
+    # Function to send the request to the real server (always non-streaming) and return its answer
+    def forward(self, endpoint, request):
+        upstream_request = dict(request, stream=False)
+        data = json.dumps(upstream_request).encode('utf-8')
+        req = urllib.request.Request(f"{self.server.state.upstream}/api/{endpoint}", data=data,
+                                     headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req) as upstream_response:
+            return json.loads(upstream_response.read())
+
+    def synthesize(self, endpoint, request):
+        latency = self.server.state.latency
+        text = synthesize_text(request)
+        prompt_text = request.get('prompt') or json.dumps(request.get('messages') or '')
+        prompt_tokens = count_tokens(prompt_text)
+        output_tokens = count_tokens(text)
+        num_predict = (request.get('options') or {}).get('num_predict')
+        if num_predict is not None and num_predict >= 0 and not isinstance(request.get('format'), dict):
+            output_tokens = min(output_tokens, max(num_predict, 1))
+            text = text[:output_tokens * 4]
+        response = {
+            "model": request.get('model'),
+            "created_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            "done": True,
+            "done_reason": "stop",
+            "load_duration": int(latency.load_time(request.get('model')) * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(latency.prefill_time(prompt_tokens) * 1e9),
+            "eval_count": output_tokens,
+            "eval_duration": int(latency.decode_time(output_tokens) * 1e9),
+        }
+        response["total_duration"] = response["load_duration"] + response["prompt_eval_duration"] + response["eval_duration"]
+        if endpoint == 'chat':
+            response["message"] = {"role": "assistant", "content": text}
+        else:
+            response["response"] = text
+            response["context"] = list(request.get('context') or []) + list(range(prompt_tokens + output_tokens))
+        return response
+
+    # Function to send a response, optionally sleeping as the latency model says, streaming when asked
+    def respond(self, request, response, paced):
+        latency = self.server.state.latency
+        stream = request.get('stream', True)
+        text_field = 'message' if 'message' in response else 'response'
+        text = response['message']['content'] if text_field == 'message' else response.get('response', '')
+        with latency.slots if paced else contextlib.nullcontext():
+            if paced:
+                time.sleep((response.get('load_duration', 0) + response.get('prompt_eval_duration', 0)) / 1e9)
+            if not stream:
+                if paced:
+                    time.sleep(response.get('eval_duration', 0) / 1e9)
+                self.send_json(response)
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            pieces = [text[i:i + 4] for i in range(0, len(text), 4)] or ['']
+            per_piece = response.get('eval_duration', 0) / 1e9 / len(pieces) if paced else 0
+            try:
+                for piece in pieces:
+                    if per_piece:
+                        time.sleep(per_piece)
+                    chunk = {"model": response.get('model'), "done": False}
+                    if text_field == 'message':
+                        chunk["message"] = {"role": "assistant", "content": piece}
+                    else:
+                        chunk["response"] = piece
+                    self.write_chunk(chunk)
+                final = {k: v for k, v in response.items() if k not in ('response', 'message')}
+                final[text_field] = {"role": "assistant", "content": ""} if text_field == 'message' else ""
+                self.write_chunk(final)
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # The client closed the stream early (see generation_profiles.consume_stream)
+                pass
+
+    def write_chunk(self, payload):
+        data = (json.dumps(payload) + '\n').encode('utf-8')
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+
+# Function to start the stand-in in a background thread; returns (server, base_url)
+def start_standin(mode='synth', port=0, recording_path=DEFAULT_RECORDING_PATH, latency=None, upstream=None, pace=True):
+    server = ThreadingHTTPServer(('127.0.0.1', port), StandinHandler)
+    server.daemon_threads = True
+    server.state = StandinState(mode, recording_path, latency or LatencyModel(), upstream=upstream, pace=pace)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ollama-compatible stand-in server for offline benchmarking")
+    parser.add_argument('--mode', choices=['replay', 'record', 'synth'], default='replay')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--recording', default=DEFAULT_RECORDING_PATH)
+    parser.add_argument('--upstream', default='http://127.0.0.1:11434', help="real Ollama server for --mode record")
+    parser.add_argument('--load-seconds', type=float, default=0.0)
+    parser.add_argument('--prefill-tps', type=float, default=400.0, help="prompt tokens per second")
+    parser.add_argument('--decode-tps', type=float, default=20.0, help="output tokens per second")
+    parser.add_argument('--parallel', type=int, default=1, help="requests served at once (OLLAMA_NUM_PARALLEL)")
+    parser.add_argument('--no-pace', action='store_true', help="answer immediately instead of simulating latency")
+    args = parser.parse_args()
+
+    latency = LatencyModel(args.load_seconds, args.prefill_tps, args.decode_tps, max_parallel=args.parallel)
+    server, url = start_standin(args.mode, args.port, args.recording, latency, args.upstream, not args.no_pace)
+    print(f"Ollama stand-in ({args.mode}) listening on {url}; set OLLAMA_HOST={url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
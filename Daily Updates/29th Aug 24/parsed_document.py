@@ -0,0 +1,206 @@
+import importlib.util
+import io
+import re
+from pathlib import Path
+
+from link_extraction import extract_links
+
+# The PDF and DOCX libraries are imported by the parser that uses them, on its first call, so importing this
+# module (and everything that imports it) does not pay for pdfminer, PyMuPDF and docx2txt up front.
+# PyMuPDF is much faster than pdfplumber but optional; without it every PDF goes through pdfplumber
+HAS_PYMUPDF = importlib.util.find_spec("fitz") is not None
+
+# Bump when parsing output changes so cached extractions (extraction_cache.py) are not reused
+PARSER_VERSION = 2
+
+# Same URL pattern the pipeline has always used for the text fallback
+URL_RE = re.compile(r'(https?://[^\s]+|www\.[^\s]+)')
+
+# A document with fewer non-whitespace characters than this has no usable text layer
+MIN_TEXT_CHARS = 100
+# Pages at least this much covered by images, with no text, are treated as scans
+MIN_IMAGE_COVERAGE = 0.5
+
+
+# Everything the pipeline needs from one resume file, produced by opening it exactly once
+class ParsedDocument:
+    def __init__(self, path, pages=None, annotation_uris=None, text_urls=None, page_stats=None):
+        self.path = path
+        # Raw (uncleaned) text per page; .docx and .txt files are a single page
+        self.pages = pages or []
+        # Hyperlink targets from PDF link annotations, in document order
+        self.annotation_uris = annotation_uris or []
+        # http(s)/www URLs found in the page text
+        self.text_urls = text_urls or []
+        # Per PDF page: {"chars": non-whitespace characters, "image_coverage": fraction of the page under images}
+        self.page_stats = page_stats or []
+        self.backend = None
+
+    def to_dict(self):
+        return {"pages": self.pages, "annotation_uris": self.annotation_uris, "text_urls": self.text_urls,
+                "page_stats": self.page_stats, "backend": self.backend}
+
+    @classmethod
+    def from_dict(cls, path, data):
+        document = cls(path, data["pages"], data["annotation_uris"], data["text_urls"], data.get("page_stats"))
+        document.backend = data.get("backend")
+        return document
+
+    @property
+    def text(self):
+        return "\n".join(page for page in self.pages if page)
+
+    # Function to get normalized profile links by category (see link_extraction.py): annotation targets first,
+    # then links in the text, including bare "linkedin.com/in/..." and URLs wrapped over two lines
+    def profile_links(self):
+        return extract_links(self.text, self.annotation_uris)
+
+
+# Function to summarize a page for the scanned-document check
+def page_stat(page_text, image_boxes, page_width, page_height):
+    page_area = (page_width * page_height) or 1
+    covered = 0.0
+    for x0, top, x1, bottom in image_boxes:
+        # Clip to the page; images often bleed over the edges
+        width = min(x1, page_width) - max(x0, 0)
+        height = min(bottom, page_height) - max(top, 0)
+        if width > 0 and height > 0:
+            covered += width * height
+    return {"chars": sum(1 for char in page_text if not char.isspace()),
+            "image_coverage": round(min(1.0, covered / page_area), 3)}
+
+
+# Function to read page text, annotation URIs and text URLs in a single pass with pdfplumber
+# pdfplumber is slow but layout-aware, so it is the fallback when the fast backend's text looks broken.
+# Every parser takes the file's bytes as data when it does not exist on disk (e.g. an archive member).
+def parse_pdf_pdfplumber(pdf_path, data=None):
+    import pdfplumber
+
+    pages = []
+    annotation_uris = []
+    text_urls = []
+    page_stats = []
+    with pdfplumber.open(io.BytesIO(data) if data is not None else pdf_path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text() or ""
+            pages.append(page_text)
+            page_stats.append(page_stat(page_text, [(image['x0'], image['top'], image['x1'], image['bottom'])
+                                                    for image in page.images], page.width, page.height))
+            text_urls.extend(URL_RE.findall(page_text))
+            for annot in page.annots or []:
+                uri = annot.get('uri')
+                if uri:
+                    annotation_uris.append(uri)
+            # Drop the page's cached layout objects as soon as we are done with it
+            if hasattr(page, 'close'):
+                page.close()
+            else:
+                page.flush_cache()
+    return ParsedDocument(pdf_path, pages, annotation_uris, text_urls, page_stats)
+
+
+# Same single pass with PyMuPDF
+def parse_pdf_pymupdf(pdf_path, data=None):
+    import fitz
+
+    pages = []
+    annotation_uris = []
+    text_urls = []
+    page_stats = []
+    with (fitz.open(stream=data, filetype="pdf") if data is not None else fitz.open(pdf_path)) as pdf:
+        for page in pdf:
+            page_text = page.get_text("text", sort=True) or ""
+            pages.append(page_text)
+            page_stats.append(page_stat(page_text, [info['bbox'] for info in page.get_image_info()],
+                                        page.rect.width, page.rect.height))
+            text_urls.extend(URL_RE.findall(page_text))
+            for link in page.get_links():
+                uri = link.get('uri')
+                if uri:
+                    annotation_uris.append(uri)
+    return ParsedDocument(pdf_path, pages, annotation_uris, text_urls, page_stats)
+
+
+PDF_BACKENDS = {
+    "pymupdf": parse_pdf_pymupdf,
+    "pdfplumber": parse_pdf_pdfplumber,
+}
+DEFAULT_PDF_BACKEND = "pymupdf" if HAS_PYMUPDF else "pdfplumber"
+FALLBACK_PDF_BACKEND = "pdfplumber"
+
+# Below this quality score the fast backend's text is considered broken and pdfplumber is tried
+MIN_TEXT_QUALITY = 0.6
+
+
+# Function to score extracted text between 0 (garbage/empty) and 1 (clean prose)
+# Penalizes unmapped glyphs ((cid:NN), U+FFFD), non-printable characters and letter-by-letter spacing
+def text_quality(text):
+    if not text or not text.strip():
+        return 0.0
+    unmapped = len(re.findall(r'\(cid:\d+\)', text)) + text.count('\ufffd')
+    printable = sum(1 for char in text if char.isprintable() or char in '\n\t')
+    words = text.split()
+    single_letters = sum(1 for word in words if len(word) == 1 and word.isalpha())
+    score = printable / len(text)
+    score -= min(1.0, unmapped * 10 / max(len(words), 1))
+    if words:
+        score -= max(0.0, single_letters / len(words) - 0.15)
+    return max(0.0, min(1.0, score))
+
+
+# Function to parse a PDF with the chosen backend, falling back when the text quality is too low
+def parse_pdf(pdf_path, backend=None, data=None):
+    backend = backend or DEFAULT_PDF_BACKEND
+    document = PDF_BACKENDS[backend](pdf_path, data)
+    document.backend = backend
+    if backend != FALLBACK_PDF_BACKEND and text_quality(document.text) < MIN_TEXT_QUALITY:
+        fallback = PDF_BACKENDS[FALLBACK_PDF_BACKEND](pdf_path, data)
+        fallback.backend = FALLBACK_PDF_BACKEND
+        if text_quality(fallback.text) > text_quality(document.text):
+            return fallback
+    return document
+
+
+def parse_docx(docx_path, data=None):
+    import docx2txt
+
+    text = docx2txt.process(io.BytesIO(data) if data is not None else docx_path) or ""
+    return ParsedDocument(docx_path, [text], [], URL_RE.findall(text))
+
+
+def parse_txt(txt_path, data=None):
+    if data is not None:
+        text = data.decode('utf-8')
+    else:
+        with open(txt_path, 'r', encoding='utf-8') as file:
+            text = file.read()
+    return ParsedDocument(txt_path, [text], [], URL_RE.findall(text))
+
+
+# Function to tell whether a document has no usable text and needs OCR before any LLM sees it
+# Returns the reason ("scanned" when its pages are mostly images, "no text" otherwise) or None
+def needs_ocr(document):
+    chars = sum(1 for char in document.text if not char.isspace())
+    if chars >= MIN_TEXT_CHARS:
+        return None
+    if any(stat["image_coverage"] >= MIN_IMAGE_COVERAGE for stat in document.page_stats):
+        return "scanned"
+    return "no text"
+
+
+# Function to name the parser configuration, so a cached extraction is only reused by the same configuration
+def extractor_version(pdf_backend=None):
+    return f"v{PARSER_VERSION}:{pdf_backend or DEFAULT_PDF_BACKEND}"
+
+
+# Function to parse any supported resume file; unsupported types give an empty document
+# With data given, file_path is only a name (its extension picks the parser) and the bytes are parsed in memory
+def parse_document(file_path, pdf_backend=None, data=None):
+    ext = Path(file_path).suffix.lower()
+    if ext == '.pdf':
+        return parse_pdf(file_path, pdf_backend, data)
+    elif ext == '.docx':
+        return parse_docx(file_path, data)
+    elif ext == '.txt':
+        return parse_txt(file_path, data)
+    return ParsedDocument(file_path)
@@ -0,0 +1,165 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Default location of the result journal; pdfs_to_cleaned_and_extracted_excel keeps one next to each workbook
+DEFAULT_RESULT_STORE_PATH = 'results.sqlite'
+
+
+# Append-only journal of finished result rows. Saving a row is one INSERT committed with an fsync, so a checkpoint
+# costs the same for the first and the thousandth resume, and a crash loses at most the row being written.
+# The workbook is built from the journal once, by export_excel, at the end of a batch or on demand.
+# Rows finish in whatever order the workers get to them; each one is journaled with its position among the
+# batch's sources, and rows() puts them back in that order (earlier, interrupted runs first).
+class ResultStore:
+    def __init__(self, path=DEFAULT_RESULT_STORE_PATH, durable=True):
+        self.path = path
+        self.durable = durable
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                filename TEXT NOT NULL,
+                row TEXT NOT NULL,
+                run INTEGER NOT NULL,
+                position INTEGER,
+                written_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_results_filename ON results (filename)")
+        # Field checkpoints: every LLM answer for a document, keyed by its content hash rather than its file name
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS fields (
+                content_hash TEXT NOT NULL,
+                context TEXT NOT NULL,
+                field TEXT NOT NULL,
+                value TEXT NOT NULL,
+                written_at REAL NOT NULL,
+                PRIMARY KEY (content_hash, context, field)
+            )
+        """)
+        conn.commit()
+        self.new_run()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # FULL syncs the WAL on every commit, so an appended row survives a power cut, not only a crash
+            conn.execute(f"PRAGMA synchronous={'FULL' if self.durable else 'NORMAL'}")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # Function to start a new run: rows appended from now on sort after every row already in the journal.
+    # Every ResultStore opened on the journal starts one.
+    def new_run(self):
+        self.run = self._connection().execute("SELECT COALESCE(MAX(run), 0) + 1 FROM results").fetchone()[0]
+
+    # Function to append one finished row (a dict with a "Filename" key); position is its source's index in the batch
+    def append(self, row, position=None):
+        conn = self._connection()
+        with conn:
+            conn.execute("INSERT INTO results (filename, row, run, position, written_at) VALUES (?, ?, ?, ?, ?)",
+                         (row["Filename"], json.dumps(row, ensure_ascii=False, default=str), self.run, position,
+                          time.time()))
+
+    # Function to get the rows run by run, each run in source order; a file written twice keeps only its latest row
+    def rows(self):
+        cursor = self._connection().execute(
+            "SELECT row FROM results WHERE id IN (SELECT MAX(id) FROM results GROUP BY filename) "
+            "ORDER BY run, position, id")
+        return [json.loads(row) for (row,) in cursor]
+
+    def filenames(self):
+        return {filename for (filename,) in self._connection().execute("SELECT DISTINCT filename FROM results")}
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(DISTINCT filename) FROM results").fetchone()[0]
+
+    # Function to get the checkpointed fields of one document: {field: value}
+    def load_fields(self, content_hash, context):
+        cursor = self._connection().execute("SELECT field, value FROM fields WHERE content_hash = ? AND context = ?",
+                                            (content_hash, context))
+        return {field: json.loads(value) for field, value in cursor}
+
+    # Function to checkpoint one field of a document, committed (and fsynced when durable) before returning
+    def save_field(self, content_hash, context, field, value):
+        conn = self._connection()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO fields (content_hash, context, field, value, written_at) "
+                         "VALUES (?, ?, ?, ?, ?)",
+                         (content_hash, context, field, json.dumps(value, ensure_ascii=False, default=str), time.time()))
+
+    def field_count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM fields").fetchone()[0]
+
+    # Function to write the workbook: rows already in it (existing_rows, e.g. from an earlier workbook) followed by
+    # the journal's rows, one row per file with the latest result winning. Returns the number of rows written.
+    def export_excel(self, excel_path, existing_rows=None):
+        import pandas as pd
+
+        df = pd.DataFrame(self.rows())
+        if existing_rows is not None and len(existing_rows):
+            df = pd.concat([existing_rows, df], ignore_index=True)
+        if len(df):
+            df = df.drop_duplicates(subset='Filename', keep='last')
+        df.to_excel(excel_path, index=False)
+        return len(df)
+
+    def print_stats(self):
+        print(f"Result store ({self.path}): {self.count()} resumes, {self.field_count()} field checkpoints")
+
+
+# Function to key checkpoints by everything besides the document that changes the answers or the row (job
+# description, skills, cleaning profile, mode flags, ...), so changing any of them starts afresh instead of
+# reusing another role's summary and score or a row without the new skill columns
+def checkpoint_context(*parts):
+    return hashlib.sha256("\x00".join(str(part) for part in parts).encode('utf-8')).hexdigest()[:16]
+
+
+# Field-level checkpoint of one document. Every field is saved as soon as it is computed, so a resume interrupted
+# after 10 of 15 skills picks up at the 11th. The key is the content hash, so a renamed or re-uploaded copy of a
+# file finds the fields (and the finished row) of the original. With store=None nothing is persisted.
+class FieldCheckpoint:
+    def __init__(self, store, content_hash, context):
+        self.store = store
+        self.content_hash = content_hash
+        self.context = context
+        self.values = store.load_fields(content_hash, context) if store is not None else {}
+        self.resumed = len(self.values)
+
+    def __contains__(self, field):
+        return field in self.values
+
+    def get(self, field, default=None):
+        return self.values.get(field, default)
+
+    def put(self, field, value):
+        self.values[field] = value
+        if self.store is not None:
+            self.store.save_field(self.content_hash, self.context, field, value)
+
+    # Function to return a checkpointed field, computing and saving it the first time. None (a failed call that
+    # the caller falls back from) is returned but not saved, so the next run asks again.
+    def get_or_compute(self, field, compute):
+        if field in self.values:
+            return self.values[field]
+        value = compute()
+        if value is not None:
+            self.put(field, value)
+        return value
+
+if __name__ == "__main__":
+    # Export the journal of a running or finished batch without waiting for it to end
+    parser = argparse.ArgumentParser(description="Export the result journal to an Excel workbook")
+    parser.add_argument("excel_path")
+    parser.add_argument("--store", default=DEFAULT_RESULT_STORE_PATH)
+    args = parser.parse_args()
+    print(f"{ResultStore(args.store).export_excel(args.excel_path)} rows written to {args.excel_path}")
@@ -0,0 +1,90 @@
+import re
+from functools import lru_cache
+
+# Heading variants per section; longer variants first so "Work Experience" wins over "Experience"
+SECTION_HEADINGS = {
+    "experience": ["work experience", "professional experience", "relevant experience", "industry experience",
+                   "employment history", "employment details", "work history", "career history",
+                   "professional background", "professional history", "employment", "career", "internships",
+                   "internship", "experience"],
+    "education": ["academic qualifications", "academic background", "educational qualifications", "education",
+                  "academics", "qualifications"],
+    "skills": ["technical skills", "key skills", "core competencies", "skill set", "skills"],
+    "projects": ["academic projects", "personal projects", "key projects", "projects"],
+    "contact": ["contact information", "contact details", "personal details", "personal information", "contact"],
+    # Headings we do not route on but which must end the preceding section
+    "other": ["certifications", "certificates", "achievements", "awards", "publications", "languages", "hobbies",
+              "interests", "extracurricular activities", "extra curricular", "positions responsibility",
+              "career objective", "objective", "professional summary", "profile summary", "summary", "declaration"],
+}
+
+# Only the first characters of the resume are treated as the header when no contact heading is present
+HEADER_CHARS = 600
+
+
+# Build the heading regexes once. A heading is a line of its own holding only the heading, optionally followed by
+# a colon, so body lines such as "Skills in Python and SQL" or "Experience with AWS" do not start a section.
+def _compile_headings():
+    patterns = {}
+    for section, headings in SECTION_HEADINGS.items():
+        alternatives = "|".join(r"[ \t]+".join(map(re.escape, heading.split())) for heading in headings)
+        patterns[section] = re.compile(rf"(?im)^[ \t]*(?:{alternatives})[ \t]*:?[ \t]*$")
+    return patterns
+
+
+HEADING_PATTERNS = _compile_headings()
+
+
+# Function to find where each section's heading starts; returns [(start, end, section)] sorted by position
+def find_headings(text):
+    found = []
+    for section, pattern in HEADING_PATTERNS.items():
+        match = pattern.search(text)
+        if match:
+            found.append((match.start(), match.end(), section))
+    found.sort()
+    return found
+
+
+# Function to split a resume into {section: text}; "header" is everything before the first heading
+# Results are cached per document text, so every extractor of the same resume reuses one segmentation
+@lru_cache(maxsize=256)
+def segment_resume(text):
+    if not isinstance(text, str):
+        return {}
+    headings = find_headings(text)
+    sections = {}
+    first_start = headings[0][0] if headings else len(text)
+    sections["header"] = text[:min(first_start, HEADER_CHARS) if headings else HEADER_CHARS].strip()
+    for index, (start, end, section) in enumerate(headings):
+        stop = headings[index + 1][0] if index + 1 < len(headings) else len(text)
+        body = text[end:stop].strip()
+        if section in sections and section != "other":
+            sections[section] += "\n" + body
+        else:
+            sections[section] = body
+    sections.pop("other", None)
+    return sections
+
+
+# Function to tell whether segmentation found enough structure to trust a missing section
+def is_segmented(sections):
+    return len([name for name in sections if name != "header"]) >= 2
+
+
+# Function to assemble the text an extractor needs from the segmented resume
+# Falls back to the full text when the needed sections were not found (or for extractors that need everything)
+def routed_text(text, wanted_sections):
+    if not wanted_sections or not isinstance(text, str):
+        return text
+    sections = segment_resume(text)
+    if not is_segmented(sections):
+        return text
+    parts = [sections[name] for name in wanted_sections if sections.get(name)]
+    return "\n".join(parts) if parts else text
+
+
+# Function to report whether a well-segmented resume has no experience section at all
+def has_no_experience_section(text):
+    sections = segment_resume(text) if isinstance(text, str) else {}
+    return is_segmented(sections) and not sections.get("experience")
@@ -0,0 +1,85 @@
+# Per-resume session: the cleaned resume is prefilled once and every question about it (profile,
+# fitment summary, score, skill batches) runs as a short follow-up on the returned `context`.
+# Follow-ups always branch from the resume context rather than chaining answers, so each question
+# costs only its own tokens and the prefill per resume stays constant as questions are added.
+# When a JobDescriptionSession is given the resume is appended to the primed JD context.
+
+import threading
+
+from jd_session import DEFAULT_KEEP_ALIVE
+
+
+# Function to build the resume block that is prefilled once per resume
+def resume_prefix(resume_text):
+    return (
+        f"Candidate Resume:\n{resume_text}\n\n"
+        "Answer each following question about this candidate using only the resume above.\n"
+    )
+
+
+# Function to build a session prompt, inlining whatever the session has not already prefilled
+def session_prompt(session, task, resume_text=None, job_description=None):
+    parts = []
+    if job_description is not None and not session.includes_job_description:
+        parts.append(f"Job Description:\n{job_description}\n")
+    if resume_text is not None and not session.includes_resume:
+        parts.append(f"Candidate Resume:\n{resume_text}\n")
+    parts.append(task)
+    return "\n".join(parts)
+
+
+class ResumeSession:
+    includes_resume = True
+
+    def __init__(self, client, resume_text, jd_session=None, model="llama3:latest", keep_alive=DEFAULT_KEEP_ALIVE,
+                 num_ctx=8192):
+        self.client = client
+        self.jd_session = jd_session
+        self.model = jd_session.model if jd_session is not None else model
+        self.keep_alive = keep_alive
+        self.num_ctx = num_ctx
+        self.includes_job_description = jd_session is not None
+        self.prefix = resume_prefix(resume_text)
+        self.context = None
+        self.prime_stats = {}
+        self._lock = threading.Lock()
+
+    # Function to prefill the resume (on top of the JD context when there is one)
+    def prime(self):
+        options = {"num_predict": 1, "num_ctx": self.num_ctx, "temperature": 0}
+        if self.jd_session is not None and self.jd_session.ensure_primed():
+            response = self.client.generate(model=self.model, prompt=self.prefix, context=self.jd_session.context,
+                                            keep_alive=self.keep_alive, options=options)
+        else:
+            response = self.client.generate(model=self.model, prompt=self.text_prefix(), keep_alive=self.keep_alive,
+                                            options=options)
+        self.context = response.get('context') or []
+        self.prime_stats = {
+            "prompt_eval_count": response.get('prompt_eval_count'),
+            "prompt_eval_duration": response.get('prompt_eval_duration'),
+        }
+        return self.context
+
+    # Full textual prefix, used when the server does not hand back a reusable context
+    def text_prefix(self):
+        if self.jd_session is not None:
+            return self.jd_session.prefix + self.prefix
+        return self.prefix
+
+    def ensure_primed(self):
+        if self.context is None:
+            with self._lock:
+                if self.context is None:
+                    self.prime()
+        return self.context
+
+    # Function to ask one follow-up question against the prefilled resume
+    def generate(self, prompt, options=None, **kwargs):
+        self.ensure_primed()
+        merged_options = {"num_ctx": self.num_ctx}
+        merged_options.update(options or {})
+        if self.context:
+            return self.client.generate(model=self.model, prompt=prompt, context=self.context,
+                                        keep_alive=self.keep_alive, options=merged_options, **kwargs)
+        return self.client.generate(model=self.model, prompt=self.text_prefix() + prompt,
+                                    keep_alive=self.keep_alive, options=merged_options, **kwargs)
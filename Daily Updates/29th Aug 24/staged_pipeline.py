@@ -0,0 +1,216 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+# Parsing and cleaning are CPU-bound, so they get one process per spare core;
+# the LLM stage only waits on HTTP, so a handful of threads is enough to keep Ollama busy
+DEFAULT_PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+DEFAULT_LLM_WORKERS = 4
+# Parsed documents waiting for the LLM stage; a full queue pauses the parsers instead of piling up memory
+DEFAULT_QUEUE_SIZE = 8
+
+# Tells an LLM worker that no more documents are coming
+_DONE = object()
+
+
+# Function run in the worker process: the stage function plus how long it kept the process busy
+def timed_call(func, item):
+    start = time.perf_counter()
+    result = func(item)
+    return result, time.perf_counter() - start
+
+
+# Busy and blocked time of one stage, summed over its workers
+class StageMetrics:
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.failures = 0
+        self.busy_seconds = 0.0
+        # Producer: time spent waiting for room in the queue. Consumer: time spent waiting for work.
+        self.blocked_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, busy=0.0, blocked=0.0, failed=False, item=True):
+        with self._lock:
+            self.busy_seconds += busy
+            self.blocked_seconds += blocked
+            if item:
+                self.items += 1
+            if failed:
+                self.failures += 1
+
+    # Function to get the fraction of the stage's worker-seconds spent doing work
+    def occupancy(self, wall_seconds):
+        if not wall_seconds:
+            return 0.0
+        return min(1.0, self.busy_seconds / (self.workers * wall_seconds))
+
+
+class PipelineMetrics:
+    def __init__(self, parse_workers, llm_workers, queue_size):
+        self.parse = StageMetrics("parse", parse_workers)
+        self.llm = StageMetrics("llm", llm_workers)
+        self.queue_size = queue_size
+        self.max_queue_depth = 0
+        self.wall_seconds = 0.0
+
+    def observe_queue(self, depth):
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def report(self):
+        rows = []
+        for stage in (self.parse, self.llm):
+            rows.append({
+                "Stage": stage.name,
+                "Workers": stage.workers,
+                "Items": stage.items,
+                "Failures": stage.failures,
+                "Busy (s)": round(stage.busy_seconds, 2),
+                "Blocked (s)": round(stage.blocked_seconds, 2),
+                "Occupancy": round(stage.occupancy(self.wall_seconds), 3),
+            })
+        return rows
+
+    # The stage whose workers were busiest limits throughput; add workers there first
+    def bottleneck(self):
+        return max((self.parse, self.llm), key=lambda stage: stage.occupancy(self.wall_seconds)).name
+
+    def print_report(self):
+        print(f"Staged pipeline: {self.wall_seconds:.2f} s, queue peak {self.max_queue_depth}/{self.queue_size}")
+        for row in self.report():
+            print(f"  {row['Stage']}: {row['Workers']} workers, {row['Items']} items ({row['Failures']} failed), "
+                  f"busy {row['Busy (s)']} s, blocked {row['Blocked (s)']} s, occupancy {row['Occupancy']:.0%}")
+        print(f"  Bottleneck: {self.bottleneck()} stage")
+
+
+# Function to run parse_func in a process pool and llm_func in threads, connected by a bounded queue,
+# yielding (index, item, result) triples as items finish. items may be any iterable and is consumed lazily: at most
+# 2 * parse_workers items are being parsed, queue_size wait for the LLM stage and queue_size finished results
+# wait for the caller, so memory stays flat however many items there are.
+# parse_func must be picklable (a module-level function or functools.partial of one); a failed item's result
+# is the exception.
+def iter_two_stage_pipeline(items, parse_func, llm_func, parse_workers=DEFAULT_PARSE_WORKERS,
+                            llm_workers=DEFAULT_LLM_WORKERS, queue_size=DEFAULT_QUEUE_SIZE, metrics=None):
+    items = iter(items)
+    handoff = queue.Queue(maxsize=queue_size)
+    finished = queue.Queue(maxsize=queue_size)
+    metrics = metrics or PipelineMetrics(parse_workers, llm_workers, queue_size)
+    stop = threading.Event()
+    producer_error = []
+
+    # Function to put into a bounded queue without hanging once the caller has stopped listening
+    def put(target, entry):
+        while not stop.is_set():
+            try:
+                target.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def hand_off(entry):
+        start = time.perf_counter()
+        put(handoff, entry)
+        metrics.parse.add(blocked=time.perf_counter() - start, item=False)
+        metrics.observe_queue(handoff.qsize())
+
+    def produce():
+        try:
+            with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+                pending = {}
+                next_index = 0
+                exhausted = False
+                while not stop.is_set() and (pending or not exhausted):
+                    # Keep every parser busy with one spare task each, no more, so a full queue stops parsing
+                    while not exhausted and len(pending) < parse_workers * 2:
+                        item = next(items, _DONE)
+                        if item is _DONE:
+                            exhausted = True
+                            break
+                        pending[pool.submit(timed_call, parse_func, item)] = (next_index, item)
+                        next_index += 1
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, item = pending.pop(future)
+                        try:
+                            parsed, busy = future.result()
+                            metrics.parse.add(busy=busy)
+                        except Exception as exc:
+                            parsed = exc
+                            metrics.parse.add(failed=True)
+                        hand_off((index, item, parsed))
+                for future in pending:
+                    future.cancel()
+        except BaseException as exc:
+            producer_error.append(exc)
+        finally:
+            for _ in range(llm_workers):
+                put(handoff, _DONE)
+
+    def consume():
+        while True:
+            start = time.perf_counter()
+            entry = None
+            while entry is None and not stop.is_set():
+                try:
+                    entry = handoff.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            metrics.llm.add(blocked=time.perf_counter() - start, item=False)
+            if entry is None or entry is _DONE:
+                put(finished, _DONE)
+                return
+            index, item, parsed = entry
+            if isinstance(parsed, BaseException):
+                result = parsed
+            else:
+                start = time.perf_counter()
+                try:
+                    result = llm_func(parsed)
+                except Exception as exc:
+                    result = exc
+                metrics.llm.add(busy=time.perf_counter() - start, failed=isinstance(result, BaseException))
+            put(finished, (index, item, result))
+
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=produce, name="parse-stage", daemon=True)]
+    threads += [threading.Thread(target=consume, name=f"llm-stage-{n}", daemon=True) for n in range(llm_workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        running = llm_workers
+        while running:
+            entry = finished.get()
+            if entry is _DONE:
+                running -= 1
+                continue
+            yield entry
+    finally:
+        # Also reached when the caller closes the generator early: let the threads wind down
+        stop.set()
+        for thread in threads:
+            thread.join()
+        metrics.wall_seconds = time.perf_counter() - start_time
+    if producer_error:
+        raise producer_error[0]
+
+
+# Function to run the pipeline to completion and return the results in the order of items
+# on_result(index, result) is called as each item finishes, one call at a time.
+# items is consumed lazily, like in iter_two_stage_pipeline; only the results are kept.
+def run_two_stage_pipeline(items, parse_func, llm_func, on_result=None, parse_workers=DEFAULT_PARSE_WORKERS,
+                           llm_workers=DEFAULT_LLM_WORKERS, queue_size=DEFAULT_QUEUE_SIZE):
+    results = {}
+    metrics = PipelineMetrics(parse_workers, llm_workers, queue_size)
+    for index, _, result in iter_two_stage_pipeline(items, parse_func, llm_func, parse_workers=parse_workers,
+                                                    llm_workers=llm_workers, queue_size=queue_size, metrics=metrics):
+        results[index] = result
+        if on_result is not None:
+            on_result(index, result)
+    return [results[index] for index in sorted(results)], metrics
@@ -0,0 +1,71 @@
+# Runs the full final_code1 pipeline against the local Ollama stand-in (ollama_standin.py) to measure
+# orchestration throughput without a GPU or a model. Every configuration starts from an empty LLM
+# response cache, an empty extraction cache and OCR queue, and a fresh output workbook.
+
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from ollama_standin import start_standin, LatencyModel
+from extraction_cache import ExtractionCache
+from ocr_queue import OCRQueue
+
+# Pipeline configurations to compare (keyword arguments of pdfs_to_cleaned_and_extracted_excel)
+CONFIGURATIONS = {
+    "Baseline (per-field, per-skill)": {"structured_extraction": False, "batched_skills": False,
+                                         "jd_primed": False, "resume_sessions": False},
+    "Structured + batched skills": {"structured_extraction": True, "batched_skills": True,
+                                    "jd_primed": False, "resume_sessions": False},
+    "Sessions": {"structured_extraction": True, "batched_skills": True, "jd_primed": True, "resume_sessions": True},
+    "Sessions + async": {"structured_extraction": True, "batched_skills": True, "jd_primed": True,
+                         "resume_sessions": True, "execution_mode": "async"},
+}
+
+
+# Main function to benchmark every configuration and save the comparison to Excel
+def run_standin_benchmark(resume_folder, job_description_file, skills_file, output_excel_path, mode='synth',
+                          recording_path='ollama_recording.jsonl', latency=None):
+    server, url = start_standin(mode=mode, recording_path=recording_path,
+                                latency=latency or LatencyModel(prefill_tokens_per_s=2000, decode_tokens_per_s=200,
+                                                                max_parallel=4))
+    # The ollama clients read OLLAMA_HOST when they are created, so set it before importing the pipeline
+    os.environ['OLLAMA_HOST'] = url
+    import final_code1
+
+    resume_count = len([f for f in os.listdir(resume_folder) if f.endswith((".pdf", ".docx", ".txt"))])
+    results = []
+    for name, options in CONFIGURATIONS.items():
+        final_code1.llm_cache.clear()
+        requests_before = server.state.stats["requests"]
+        with tempfile.TemporaryDirectory() as scratch:
+            # Parsed documents and queued OCR work would otherwise carry over and only the first configuration
+            # would pay for parsing
+            final_code1.extraction_cache = ExtractionCache(os.path.join(scratch, 'extraction_cache.sqlite'))
+            final_code1.ocr_queue = OCRQueue(os.path.join(scratch, 'ocr_queue.sqlite'))
+            start = time.time()
+            final_code1.pdfs_to_cleaned_and_extracted_excel(resume_folder, job_description_file, skills_file,
+                                                            os.path.join(scratch, 'output.xlsx'), **options)
+            elapsed = time.time() - start
+        llm_requests = server.state.stats["requests"] - requests_before
+        results.append({
+            "Configuration": name,
+            "Resumes": resume_count,
+            "LLM Requests": llm_requests,
+            "LLM Requests / Resume": round(llm_requests / resume_count, 2) if resume_count else None,
+            "Wall Time (s)": round(elapsed, 2),
+            "Resumes / min": round(resume_count / elapsed * 60, 2) if elapsed else None,
+        })
+        print(results[-1])
+
+    server.shutdown()
+    df = pd.DataFrame(results)
+    df.to_excel(output_excel_path, index=False)
+    print(f"Results saved to {output_excel_path}")
+
+if __name__ == "__main__":
+    resume_folder = r'C:\Users\vijet\OneDrive\Desktop\Profiling Project\Resumes Data\10 Resumes'
+    job_description_file = r"C:\Users\vijet\OneDrive\Desktop\Profiling Project\Role Description.txt"
+    skills_file = r"C:\Users\vijet\OneDrive\Desktop\Profiling Project\Experimentation Documents\Daily Work\21 Aug\Final Code 0\Evaluation Criteria Sheet.xlsx"
+    run_standin_benchmark(resume_folder, job_description_file, skills_file, 'standin_benchmark_results.xlsx')
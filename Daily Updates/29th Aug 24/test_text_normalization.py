@@ -0,0 +1,36 @@
+import pytest
+
+from text_normalization import normalize_dates, compress_for_llm
+
+
+# Words that start like a month, and numbers that look like month.year, are not dates
+@pytest.mark.parametrize("text", [
+    "Digital Marketing 2019",
+    "Decathlon 2022",
+    "Junior 2021",
+    "Mayank 2001",
+    "Augusta 2019",
+    "CGPA 8.2019",
+])
+def test_normalize_dates_leaves_non_dates_alone(text):
+    assert normalize_dates(text) == text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("September, 2021", "Sep 2021"),
+    ("Sept. 2021", "Sep 2021"),
+    ("sep'21", "Sep 2021"),
+    ("June 2020", "Jun 2020"),
+    ("Mar 2019", "Mar 2019"),
+    ("03/2021", "Mar 2021"),
+    ("3-2021", "Mar 2021"),
+    ("Jul 2019 - till date", "Jul 2019-Present"),
+    ("March 2019 to December 2021", "Mar 2019-Dec 2021"),
+])
+def test_normalize_dates_rewrites_dates(text, expected):
+    assert normalize_dates(text) == expected
+
+
+def test_llm_profile_keeps_words_that_start_like_months():
+    page = "Digital Marketing 2019\nDecathlon 2022\nCGPA 8.2019"
+    assert compress_for_llm([page]) == page
@@ -0,0 +1,161 @@
+import re
+
+from english_stopwords import ENGLISH_STOP_WORDS
+
+# Everything here produces exactly the same output as the original per-call implementations
+# (see benchmark_text_normalization.py), but the patterns and the stopword set are built once.
+
+
+# Control characters 0-31, which openpyxl refuses to write into a cell
+EXCEL_ILLEGAL_RE = re.compile(r'[\x00-\x1f]+')
+
+# The four clean_text_column substitutions as one pass of zero-width matches. Inserting a space can never create a
+# new match or remove one of the others, so one pass gives the same result as the four sequential re.sub calls
+# ((\d)([A-Z]) is covered by (\d)([a-zA-Z])).
+WORD_BOUNDARY_RE = re.compile(r'(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])|(?<=\d)(?=[a-zA-Z])')
+
+
+# The NLTK + scikit-learn English stopword set, vendored so it needs no download
+def stop_words():
+    return ENGLISH_STOP_WORDS
+
+
+# Function to remove the characters str.isprintable() rejects (including newlines and tabs)
+# A resume only has a handful of distinct characters, so testing the set and deleting the few bad ones
+# is much cheaper than testing every character
+def remove_non_printable(text):
+    if text.isprintable():
+        return text
+    for char in [char for char in set(text) if not char.isprintable()]:
+        text = text.replace(char, '')
+    return text
+
+
+def remove_excel_illegal(text):
+    return EXCEL_ILLEGAL_RE.sub('', text)
+
+
+# Function to clean the extracted text by removing non-printable characters and stopwords
+def clean_text(text):
+    words = stop_words()
+    return ' '.join(word for word in remove_non_printable(text).split() if word.lower() not in words)
+
+
+# Function to split camelCase, digit/letter and ACRONYMWord runs with a space; non-strings pass through
+def clean_text_column(text):
+    if isinstance(text, str):
+        text = WORD_BOUNDARY_RE.sub(' ', text)
+    return text
+
+
+# Function to clean a parsed document's pages the original way: stopwords removed, one line per page
+# Suited to lexical matching and indexing; LLM prompts use compress_for_llm instead
+def clean_pages(pages):
+    return clean_text_column("\n".join(clean_text(page) for page in pages if page))
+
+
+# Bullets, arrows, check marks, stars and the private-use bullets Word/Symbol fonts leave in PDFs
+DECORATIVE_GLYPHS_RE = re.compile('[\u2022\u2023\u2043\u2219\u25a0-\u25ff\u2190-\u21ff\u2605\u2606\u2713-\u2718'
+                                  '\u2794-\u27bf\u2756\u00b7\u00a7\uf000-\uf0ff]')
+DASHES_RE = re.compile('[\u2010-\u2015\u2212]')
+# Lines with no letters or digits (rules like "-----" or "|  |") and bare page numbers ("Page 2 of 3", "2/3")
+SEPARATOR_LINE_RE = re.compile(r'^[\W_]*$')
+PAGE_NUMBER_RE = re.compile(r'^(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?$', re.IGNORECASE)
+
+MONTHS = {"jan": "Jan", "feb": "Feb", "mar": "Mar", "apr": "Apr", "may": "May", "jun": "Jun", "jul": "Jul",
+          "aug": "Aug", "sep": "Sep", "oct": "Oct", "nov": "Nov", "dec": "Dec"}
+# "September, 2021", "Sept. 2021", "sep'21" -> "Sep 2021". Only real month spellings: "Marketing 2019",
+# "Decathlon 2022" or "Mayank 2001" are left alone.
+MONTH_YEAR_RE = re.compile(r"\b(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|"
+                           r"sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?,?\s*"
+                           r"(?:(\d{4})|['\u2019](\d{2}))\b", re.IGNORECASE)
+# "03/2021", "3-2021" -> "Mar 2021". "." is not a separator: "CGPA 8.2019" is a grade, not a date.
+NUMERIC_MONTH_YEAR_RE = re.compile(r'\b(0?[1-9]|1[0-2])[/-]((?:19|20)\d{2})\b')
+# "2019 - till date", "Jan 2020 to Current" -> "2019-Present", "Jan 2020-Present"
+OPEN_RANGE_RE = re.compile(r'(\d{4})\s*(?:-|to|till|until)\s*(?:present|current(?:ly)?|now|ongoing|till\s+date|to\s+date|date)\b',
+                           re.IGNORECASE)
+# "2019 to 2021", "Jan 2019 - Mar 2021" -> "2019-2021", "Jan 2019-Mar 2021"
+CLOSED_RANGE_RE = re.compile(r'(\d{4})\s*(?:-|to|till|until)\s*(?=(?:[A-Z][a-z]{2} )?\d{4}\b)')
+NUMERIC_MONTH_NAMES = [None, "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Lines at least this long are dropped when they repeat; shorter ones (headings like "Responsibilities") are kept
+MIN_DEDUP_LINE_CHARS = 25
+# How many lines at the top and bottom of a page can be a running header or footer
+HEADER_FOOTER_LINES = 2
+
+
+def _month_year(match):
+    year = match.group(2) or "20" + match.group(3)
+    return f"{MONTHS[match.group(1)[:3].lower()]} {year}"
+
+
+# Function to write dates one way so the model sees fewer, more regular tokens
+def normalize_dates(text):
+    text = MONTH_YEAR_RE.sub(_month_year, text)
+    text = NUMERIC_MONTH_YEAR_RE.sub(lambda match: f"{NUMERIC_MONTH_NAMES[int(match.group(1))]} {match.group(2)}", text)
+    text = OPEN_RANGE_RE.sub(r'\1-Present', text)
+    return CLOSED_RANGE_RE.sub(r'\1-', text)
+
+
+# Function to compress a document for LLM prompts. Unlike clean_pages it keeps stopwords (names like "Will",
+# phrases like "worked on") and line structure, and instead removes what costs tokens without carrying
+# information: decorative glyphs, runs of whitespace, separator lines, page numbers, repeated headers/footers
+# and other repeated lines, and verbose date formats.
+def compress_for_llm(pages):
+    lines = []
+    seen = set()
+    earlier_edges = set()
+    for page in pages:
+        if not page:
+            continue
+        page_lines = []
+        for line in page.splitlines():
+            line = DECORATIVE_GLYPHS_RE.sub(' ', remove_non_printable(line))
+            line = normalize_dates(' '.join(DASHES_RE.sub('-', line).split()))
+            if line and not SEPARATOR_LINE_RE.match(line) and not PAGE_NUMBER_RE.match(line):
+                page_lines.append(line)
+        edges = page_lines[:HEADER_FOOTER_LINES] + page_lines[-HEADER_FOOTER_LINES:]
+        for position, line in enumerate(page_lines):
+            key = line.lower()
+            # A line at the top or bottom of the page that was also at the top or bottom of an earlier page
+            # is a running header/footer
+            at_edge = position < HEADER_FOOTER_LINES or position >= len(page_lines) - HEADER_FOOTER_LINES
+            if at_edge and key in earlier_edges:
+                continue
+            if lines and key == lines[-1].lower():
+                continue
+            if len(line) >= MIN_DEDUP_LINE_CHARS:
+                if key in seen:
+                    continue
+                seen.add(key)
+            lines.append(line)
+        earlier_edges.update(line.lower() for line in edges)
+    return clean_text_column("\n".join(lines))
+
+
+# Function to prepare a document's text for Excel: the text as extracted, minus characters openpyxl rejects
+def clean_for_excel(pages):
+    return remove_excel_illegal("\n".join(page for page in pages if page))
+
+
+# Cleaning profile per consumer of the text: LLM prompts, lexical matching/indexing and Excel export
+CLEANING_PROFILES = {
+    "llm": compress_for_llm,
+    "lexical": clean_pages,
+    "excel": clean_for_excel,
+}
+DEFAULT_CLEANING_PROFILE = "llm"
+
+
+def clean_document(pages, profile=DEFAULT_CLEANING_PROFILE):
+    return CLEANING_PROFILES[profile](pages)
+
+
+# pandas Series versions; missing values and other non-strings are left as they are, like clean_text_column does
+def clean_text_series(series):
+    return series.map(lambda value: clean_text(value) if isinstance(value, str) else value)
+
+
+def clean_text_column_series(series):
+    return series.str.replace(WORD_BOUNDARY_RE, ' ', regex=True).where(series.map(lambda value: isinstance(value, str)),
+                                                                          series)